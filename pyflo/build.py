@@ -5,18 +5,36 @@
 
 """
 
-import copy
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 
 from pyflo import networks
 
 
+def _build_adjacency(links):
+    """Index links by the nodes at each of their ends.
+
+    Args:
+        links (Iterable[pyflo.links.Link]): Available links, iterated once.
+
+    Returns:
+        Tuple[Dict, Dict]: Two dictionaries, mapping each node to the links that start from it
+            (by node_1) and the links that end at it (by node_2). Links keep their input order.
+
+    """
+    by_node_1 = {}
+    by_node_2 = {}
+    for link in links:
+        by_node_1.setdefault(link.node_1, []).append(link)
+        by_node_2.setdefault(link.node_2, []).append(link)
+    return by_node_1, by_node_2
+
+
 def links_up_from_node(node, links):
     """Gets a list of links traced upstream from a node, ordered from closest to farthest.
 
     Args:
         node (networks.Node): The most downstream node that links will be traced upstream.
-        links (List[pyflo.links.Link]): Available links.
+        links (Iterable[pyflo.links.Link]): Available links, iterated once.
 
     Returns:
         List[pyflo.links.Link]: A list of links, ordered upstream from node.
@@ -35,15 +53,17 @@ def links_up_from_node(node, links):
             | ['S-8', 'S-6', 'S-7', 'S-4', 'S-5']
 
     """
+    _, by_node_2 = _build_adjacency(links)
+    visited = {node}
     queue = [node]
     links_out = []
-    links_in = copy.copy(links)
     while queue:
         curr_node = queue.pop()
-        for i, link in enumerate(links_in):
-            if link.node_2 == curr_node and link.node_1 not in queue:
+        for link in by_node_2.get(curr_node, ()):
+            if link.node_1 not in visited:
+                visited.add(link.node_1)
                 queue.append(link.node_1)
-                links_out.append(links_in[i])
+                links_out.append(link)
     return links_out
 
 
@@ -52,7 +72,7 @@ def links_down_to_node(node, links):
 
     Args:
         node (networks.Node): The most downstream node that links will be traced downstream.
-        links (List[pyflo.links.Link]): Available links.
+        links (Iterable[pyflo.links.Link]): Available links, iterated once.
 
     Returns:
         List[pyflo.links.Link]: A list of links, ordered downstream to node.
@@ -81,7 +101,7 @@ def links_down_from_node(node, links):
 
     Args:
         node (networks.Node): The most upstream node that links will be traced downstream.
-        links (List[pyflo.links.Link]): Available links.
+        links (Iterable[pyflo.links.Link]): Available links, iterated once.
 
     Returns:
         List[pyflo.links.Link]: A list of links, ordered downstream from node.
@@ -100,16 +120,17 @@ def links_down_from_node(node, links):
             | ['S-4', 'S-7', 'S-8']
 
     """
+    by_node_1, _ = _build_adjacency(links)
+    visited = {node}
     links_out = []
-    queue = node
-    links_in = copy.copy(links)
-    while queue:
-        queue = None
-        for i, link in enumerate(links_in):
-            if link.node_1 == queue:
-                links_out.append(links_in.pop(i))
-                queue = link.node_2
-                break
+    curr_node = node
+    while curr_node in by_node_1:
+        link = by_node_1[curr_node][0]
+        links_out.append(link)
+        curr_node = link.node_2
+        if curr_node in visited:
+            break
+        visited.add(curr_node)
     return links_out
 
 
@@ -118,7 +139,7 @@ def links_up_to_node(node, links):
 
     Args:
         node (networks.Node): The most upstream node that links will be traced upstream.
-        links (List[pyflo.links.Link]): Available links.
+        links (Iterable[pyflo.links.Link]): Available links, iterated once.
 
     Returns:
         List[pyflo.links.Link]: A list of links, ordered upstream to node.
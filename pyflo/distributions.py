@@ -54,6 +54,11 @@ EVAL_FUNCS = {
 }
 
 
+_X_NAME = '_x'  # The name standing in for the input in parsed equations
+# simpleeval 0.9.11 and later parse an expression once, for SimpleEval.eval(previously_parsed=)
+_PARSE_ONCE = hasattr(simpleeval.SimpleEval, 'parse')
+
+
 class Evaluator(object):
 
     def __init__(self, equation, x_key, eq_kwargs=None, **kwargs):
@@ -70,8 +75,30 @@ class Evaluator(object):
         self.x_key = x_key
         self.eq_kwargs = eq_kwargs
         self.x_multi = kwargs.pop('x_multi', None)
+        self._evaluator = simpleeval.SimpleEval(  # Own names, the input is assigned to them
+            functions=EVAL_FUNCS, names=dict(simpleeval.DEFAULT_NAMES)
+        )
+        self._parse_key = None                      # The attributes the equation was parsed for
+        self._parsed = None                         # The equation with the input as a name, parsed
         self.get_y(x=1.0)
 
+    def _produced(self, x):
+        # The equation string with the additional variables and the input substituted
+        eq = self.equation
+        for key, val in self.eq_kwargs.items():
+            eq = eq.replace(key, str(val))
+        return eq.replace(self.x_key, str(x))
+
+    def _parse(self):
+        """Get the equation with the input as a name, and its parsed tree if simpleeval can reuse
+        one, parsing it again only when the attributes have changed."""
+        key = (self.equation, self.x_key, tuple(self.eq_kwargs.items()))
+        if key != self._parse_key:
+            expr = self._produced(_X_NAME)
+            self._parsed = expr, self._evaluator.parse(expr) if _PARSE_ONCE else None
+            self._parse_key = key
+        return self._parsed
+
     def get_y(self, x):
         """Get the corresponding output of the evaluated equation string, given an input.
 
@@ -85,16 +112,16 @@ class Evaluator(object):
             ValueError: If the equation string is invalid.
 
         """
-        eq = self.equation
-        for key, val in self.eq_kwargs.items():
-            eq = eq.replace(key, str(val))
         if self.x_multi:
             x *= self.x_multi
-        eq = eq.replace(self.x_key, str(x))
         try:
-            return simpleeval.simple_eval(eq, functions=EVAL_FUNCS)
-        except:
-            raise ValueError('Error in the produced equation: {0}'.format(eq))
+            expr, parsed = self._parse()
+            self._evaluator.names[_X_NAME] = x
+            if parsed is None:
+                return self._evaluator.eval(expr)
+            return self._evaluator.eval(expr, previously_parsed=parsed)
+        except Exception:
+            raise ValueError('Error in the produced equation: {0}'.format(self._produced(x)))
 
     def get_data(self, x_max, x_delta, product=False):
         """Generate ordered pairs over the defined range.
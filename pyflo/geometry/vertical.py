@@ -1,4 +1,6 @@
 
+import bisect
+
 import numpy as np
 
 
@@ -15,43 +17,62 @@ class Point:
 
         """
         self.profile = profile
-        self.station = station
-        self.elevation = elevation
-        self.length = length
+        self._station = station
+        self._elevation = elevation
+        self._length = length
+        self._index = None  # Position within profile.pts, maintained by the profile
+        self._cache = {}    # Derived values, rebuilt by the profile after each edit
+
+    @property
+    def station(self):
+        return self._station
+
+    @station.setter
+    def station(self, value):
+        self._station = value
+        if self._index is not None:
+            self.profile._sort()
+        self.profile._dirty = True
+
+    @property
+    def elevation(self):
+        return self._elevation
+
+    @elevation.setter
+    def elevation(self, value):
+        self._elevation = value
+        self.profile._dirty = True
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+        self.profile._dirty = True
 
     def prev_pt(self):
         # if self is not self.profile.first_station:
         if self.station != self.profile.first_station:
-            i = self.profile.pts.index(self)
-            pt = self.profile.pts[i - 1]
-            return pt
+            return self.profile.pts[self._index - 1]
 
     def next_pt(self):
         # if self is not self.profile.last_station:
         if self.station != self.profile.last_station:
-            i = self.profile.pts.index(self)
-            pt = self.profile.pts[i + 1]
-            return pt
+            return self.profile.pts[self._index + 1]
 
     def g1(self):
-        pt = self.prev_pt()
-        if pt:
-            return (self.elevation-pt.elevation) / (self.station-pt.station)
+        return self._derived()['g1']
 
     def g2(self):
-        pt = self.next_pt()
-        if pt:
-            return (pt.elevation-self.elevation) / (pt.station-self.station)
+        return self._derived()['g2']
 
     def r(self):
-        g1, g2 = self.g1(), self.g2()
-        if g1 and g2 and self.length:
-            return (g2-g1) / self.length * 10000.0
+        return self._derived()['r']
 
     def k(self):
-        g1, g2 = self.g1(), self.g2()
-        if self.length and g1 and g2:
-            return abs(self.length / (g2-g1) / 100.0)
+        return self._derived()['k']
 
     @property
     def pvc_station(self):
@@ -62,14 +83,62 @@ class Point:
         return self.station + self.length/2.0
 
     def pvc_elevation(self):
-        return self.elevation + self.g1() * (self.pvc_station-self.station)
+        return self._derived()['pvc_elevation']
 
     def pvt_elevation(self):
-        return self.elevation + self.g2() * (self.pvt_station-self.station)
+        return self._derived()['pvt_elevation']
 
     def extremum_station(self):
-        if self.r():
-            return self.pvc_station - self.g1()/self.r()*10000.0
+        return self._derived()['extremum_station']
+
+    def _derived(self):
+        if self.profile._dirty:
+            self.profile.refresh()
+        return self._cache
+
+    def _grades(self):
+        """Compute the grades from the previous point and to the next point.
+
+        Returns:
+            Tuple[float, float]: g1 and g2, either of which is None at the ends of the profile.
+
+        """
+        g1 = g2 = None
+        pt = self.prev_pt()
+        if pt:
+            g1 = (self.elevation-pt.elevation) / (self.station-pt.station)
+        pt = self.next_pt()
+        if pt:
+            g2 = (pt.elevation-self.elevation) / (pt.station-self.station)
+        return g1, g2
+
+    def _derive(self):
+        """Compute the grades and curve values that depend on the neighboring points.
+
+        Returns:
+            dict: The derived values, keyed by the name of the method that returns each.
+
+        """
+        r = k = pvc_elevation = pvt_elevation = extremum_station = None
+        g1, g2 = self._grades()
+        if g1 is not None:
+            pvc_elevation = self.elevation + g1 * (self.pvc_station-self.station)
+        if g2 is not None:
+            pvt_elevation = self.elevation + g2 * (self.pvt_station-self.station)
+        if g1 and g2 and self.length:
+            r = (g2-g1) / self.length * 10000.0
+            k = abs(self.length / (g2-g1) / 100.0)
+        if r:
+            extremum_station = self.pvc_station - g1/r*10000.0
+        return {
+            'g1': g1,
+            'g2': g2,
+            'r': r,
+            'k': k,
+            'pvc_elevation': pvc_elevation,
+            'pvt_elevation': pvt_elevation,
+            'extremum_station': extremum_station,
+        }
 
 
 class Profile:
@@ -77,36 +146,98 @@ class Profile:
     def __init__(self):
         """A collection of points that represent a vertical alignment"""
         self.pts = []
+        self._stations = []  # Parallel to pts, kept sorted for bisection
+        self._dirty = False
+        self._arrays = None
+        self._pvc_stations = []  # Parallel to pts, for bisection
+        self._pvt_stations = []  # Parallel to pts, for bisection
 
     @property
     def first_station(self):
         if self.pts:
-            return min(point.station for point in self.pts)
+            return self.pts[0].station
         return None
 
     @property
     def last_station(self):
         if self.pts:
-            return max(point.station for point in self.pts)
+            return self.pts[-1].station
         return None
 
     def create_pt(self, station, elevation, length=0.0):
         pt = Point(self, station, elevation, length)
-        self.pts.append(pt)
-        self.pts.sort(key=lambda p: p.station)
+        i = bisect.bisect_right(self._stations, station)
+        self._stations.insert(i, station)
+        self.pts.insert(i, pt)
+        for j in range(i, len(self.pts)):
+            self.pts[j]._index = j
+        self._dirty = True
         return pt
 
+    def _sort(self):
+        """Reorder the points by station after the station of a point is edited."""
+        self.pts.sort(key=lambda pt: pt.station)
+        self._stations = [pt.station for pt in self.pts]
+        for j, pt in enumerate(self.pts):
+            pt._index = j
+
+    def refresh(self):
+        """Recompute the grades and curve values of every point.
+
+        Note:
+            Called automatically on the next query after :meth:`create_pt` or after editing
+            the station, elevation or length of a point.
+
+        """
+        for pt in self.pts:
+            pt._cache = pt._derive()
+        self._pvc_stations = [pt.pvc_station for pt in self.pts]
+        self._pvt_stations = [pt.pvt_station for pt in self.pts]
+        self._dirty = False
+        self._arrays = None
+
+    def _as_arrays(self):
+        """Get the point attributes as arrays, ordered by station, for batch station queries.
+
+        Returns:
+            dict: A :class:`numpy.ndarray` for each attribute. Undefined values are `nan`.
+
+        """
+        if self._dirty:
+            self.refresh()
+        if self._arrays is None:
+            names = ('station', 'length', 'pvc_station', 'pvt_station')
+            derived = ('g1', 'g2', 'r', 'pvc_elevation', 'extremum_station')
+            arrays = {name: np.array([getattr(pt, name) for pt in self.pts], dtype=float)
+                      for name in names}
+            for name in derived:
+                values = [pt._cache[name] for pt in self.pts]
+                arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+            self._arrays = arrays
+        return self._arrays
+
+    def _controlling_indices(self, stations):
+        """Get the indices of the previous PVC and next PVT points for each of the stations."""
+        arrays = self._as_arrays()
+        i_pvc = np.searchsorted(arrays['pvc_station'], stations, side='right') - 1
+        i_pvt = np.searchsorted(arrays['pvt_station'], stations, side='right')
+        if np.any(i_pvt >= len(self.pts)):
+            raise ValueError('Stations must be before the last station of the profile.')
+        return i_pvc, i_pvt
+
     def prev_pvc_pt(self, station):
-        for i, pt in enumerate(self.pts):
-            pvc_station = pt.pvc_station
-            if pvc_station > station:
-                return self.pts[i - 1]
+        if self._dirty:
+            self.refresh()
+        i = bisect.bisect_right(self._pvc_stations, station)
+        if i < len(self.pts):
+            return self.pts[i - 1]
 
     def next_pvt_pt(self, station):
-        for pt in self.pts:
-            pvt_station = pt.pvt_station
-            if pvt_station > station:
-                return pt
+        if self._dirty:
+            self.refresh()
+        i = bisect.bisect_right(self._pvt_stations, station)
+        if i < len(self.pts):
+            return self.pts[i]
 
     def slope(self, station):
         """Gets the slope at a station along the profile.
@@ -125,15 +256,16 @@ class Profile:
                 2. The matching point has no specified length.
 
         """
-        for pt in sorted(self.pts, key=lambda p: p.station):
+        i = bisect.bisect_left(self._stations, station)
+        for pt in self.pts[i:]:
+            if pt.station != station:
+                break
             if pt.length == 0.0:                            # Curve not smooth
-                if pt.station == station:
-                    if pt.g1() < 0.0 and pt.g2() < 0.0:     # Both grades negative
-                        return pt.g1()
-                    elif pt.g1() > 0.0 and pt.g2() > 0.0:   # Both grades positive
-                        return pt.g2()
-                elif pt.station > station:
-                    break
+                g1, g2 = pt.g1(), pt.g2()
+                if g1 < 0.0 and g2 < 0.0:                   # Both grades negative
+                    return g1
+                elif g1 > 0.0 and g2 > 0.0:                 # Both grades positive
+                    return g2
 
         pt_pvc_prev = self.prev_pvc_pt(station)
         pt_pvt_next = self.next_pvt_pt(station)
@@ -146,31 +278,88 @@ class Profile:
         pt_pvc_prev = self.prev_pvc_pt(station)
         pt_pvt_next = self.next_pvt_pt(station)
         pt = pt_pvt_next
+        g1, g2 = pt.g1(), pt.g2()
         x = station-pt.pvc_station
-        elevation = pt.pvc_elevation() + pt.g1()*x
+        elevation = pt.pvc_elevation() + g1*x
         if pt_pvc_prev is pt_pvt_next:
-            a = pt.g2()-pt.g1()
-            elevation += a * x**2.0 / (2.0*pt.length)
+            a = g2-g1
+            elevation += a * x * x / (2.0*pt.length)
         return elevation
 
+    def slopes(self, stations):
+        """Gets the slopes at many stations along the profile at once.
+
+        Args:
+            stations (numpy.ndarray): Positions along the profile, in :math:`feet`.
+
+        Returns:
+            numpy.ndarray: The slopes along the profile, in :math:`feet/feet`.
+
+        Note:
+            Equivalent to calling :meth:`slope` for each station.
+
+        """
+        stations = np.asarray(stations, dtype=float)
+        arrays = self._as_arrays()
+        i_pvc, i_pvt = self._controlling_indices(stations)
+        g1 = arrays['g1'][i_pvt]
+        in_curve = i_pvc == i_pvt
+        x = stations - arrays['pvc_station'][i_pvt]
+        slopes = np.where(in_curve, g1 + x * arrays['r'][i_pvt] / 10000.0, g1)
+
+        # Stations that are not smooth, see slope()
+        i_pt = np.minimum(np.searchsorted(arrays['station'], stations), len(self.pts) - 1)
+        g1_pt = arrays['g1'][i_pt]
+        g2_pt = arrays['g2'][i_pt]
+        unsmooth = (arrays['station'][i_pt] == stations) & (arrays['length'][i_pt] == 0.0)
+        slopes = np.where(unsmooth & (g1_pt < 0.0) & (g2_pt < 0.0), g1_pt, slopes)
+        slopes = np.where(unsmooth & (g1_pt > 0.0) & (g2_pt > 0.0), g2_pt, slopes)
+        return slopes
+
+    def elevations(self, stations):
+        """Gets the elevations at many stations along the profile at once.
+
+        Args:
+            stations (numpy.ndarray): Positions along the profile, in :math:`feet`.
+
+        Returns:
+            numpy.ndarray: The elevations along the profile, in :math:`feet`.
+
+        Note:
+            Equivalent to calling :meth:`elevation` for each station.
+
+        """
+        stations = np.asarray(stations, dtype=float)
+        arrays = self._as_arrays()
+        i_pvc, i_pvt = self._controlling_indices(stations)
+        g1 = arrays['g1'][i_pvt]
+        x = stations - arrays['pvc_station'][i_pvt]
+        elevations = arrays['pvc_elevation'][i_pvt] + g1*x
+        in_curve = i_pvc == i_pvt
+        i_curve = i_pvt[in_curve]
+        a = arrays['g2'][i_curve] - g1[in_curve]
+        x_curve = x[in_curve]
+        elevations[in_curve] += a * x_curve*x_curve / (2.0*arrays['length'][i_curve])
+        return elevations
+
     def key_stations(self, decimals, curve_step=None, include=None,
                      extremum=True, pvc=True, pvt=True):
-        stations = []
-        for pt in self.pts:
-            if extremum:
-                extremum_station = pt.extremum_station()
-                if extremum_station:
-                    stations.append(round(extremum_station, decimals))
-            if pt.length == 0.0:
-                stations.append(pt.station)
-            if pvc and pt.pvc_station:
-                stations.append(round(pt.pvc_station, decimals))
-            if pvt and pt.pvt_station:
-                stations.append(round(pt.pvt_station, decimals))
-            if curve_step:
-                smooth_stations = np.arange(pt.pvc_station, pt.pvt_station, curve_step)
-                smooth_stations = np.round(smooth_stations, decimals=decimals)
-                stations += smooth_stations.tolist()
+        arrays = self._as_arrays()
+        rounded = [np.empty(0)]
+        if extremum:
+            extremum_stations = arrays['extremum_station']
+            rounded.append(extremum_stations[np.nan_to_num(extremum_stations) != 0.0])
+        if pvc:
+            rounded.append(arrays['pvc_station'][arrays['pvc_station'] != 0.0])
+        if pvt:
+            rounded.append(arrays['pvt_station'][arrays['pvt_station'] != 0.0])
+        if curve_step:
+            for pvc_station, pvt_station in zip(arrays['pvc_station'], arrays['pvt_station']):
+                rounded.append(np.arange(pvc_station, pvt_station, curve_step))
+        chunks = [
+            np.round(np.concatenate(rounded), decimals=decimals),
+            arrays['station'][arrays['length'] == 0.0],
+        ]
         if include:
-            stations += list(include)
-        return sorted(list(set(stations)))
+            chunks.append(np.array(list(include), dtype=float))
+        return np.unique(np.concatenate(chunks)).tolist()
@@ -0,0 +1,582 @@
+"""Compiled arithmetic kernels for the hydraulic solvers.
+
+The kernels operate on flat floats and tuples so they can be compiled by `numba`, when it is
+installed. Sections describe themselves to the kernels with a shape tuple in the form::
+
+    (kind, param_1, param_2, param_3, count)
+
+:copyright: 2016, See AUTHORS for more details.
+:license: GNU General Public License, See LICENSE for more details.
+
+"""
+
+import math
+
+import numpy as np
+
+from pyflo import constants
+
+try:
+    import numba
+except ImportError:  # numba is optional, the solvers fall back to scipy
+    numba = None
+
+ENABLED = numba is not None
+
+CIRCLE = 1.0
+RECTANGLE = 2.0
+TRAPEZOID = 3.0
+
+XTOL = 2e-12                # Same defaults as scipy.optimize.brentq
+RTOL = 4.0 * 2.220446049250313e-16
+MAX_ITER = 100
+
+TWO_G = 2.0 * constants.G
+
+
+def jit(func=None, cache=True):
+    """Compile a function in nopython mode if numba is installed, otherwise leave it as is.
+
+    Args:
+        func: The function.
+        cache (bool): Whether to cache the compiled function on disk. Functions taking other
+            compiled functions as arguments, or closing over them, cannot be cached reliably.
+
+    """
+    if func is None:
+        return lambda f: jit(f, cache)
+    if ENABLED and numba is not None:
+        return numba.njit(cache=cache)(func)
+    return func
+
+
+@jit
+def geometry(shape, depth):
+    """Get the flow area, wet perimeter and surface width of a section at a depth.
+
+    Args:
+        shape (Tuple[float, float, float, float, float]): The kernel shape of the section.
+        depth (float): Depth, in :math:`feet`.
+
+    Returns:
+        Tuple[float, float, float]: Area, in :math:`feet^2`, wet perimeter and surface width,
+            in :math:`feet`.
+
+    """
+    kind, p_1, p_2, p_3, count = shape
+    if kind == CIRCLE:
+        d_calc = min(depth, p_1)
+        if d_calc < 0.0:
+            raise ValueError('math domain error')                                   # as math.acos
+        alpha = 2.0 * math.acos(1.0 - 2.0 * d_calc / p_1)
+        a_f = count * p_1 * p_1 / 8.0 * (alpha - math.sin(alpha))
+        p_w = count * alpha * p_1 / 2.0
+        w_s = count * p_1 * math.sin(alpha / 2.0)
+    elif kind == RECTANGLE:
+        a_f = min(depth, p_2) * p_1
+        p_w = p_1 + 2.0*depth if depth < p_2 else 2.0*p_1 + 2.0*p_2
+        w_s = p_1
+    else:
+        d_sq = depth * depth
+        a_f = d_sq / 2.0 / p_1 + p_2 * depth + d_sq / 2.0 / p_3
+        p_w = depth*math.hypot(1.0, 1.0/p_1) + p_2 + depth*math.hypot(1.0, 1.0/p_3)
+        w_s = depth / p_1 + p_2 + depth / p_3
+    return a_f, p_w, w_s
+
+
+@jit
+def irregular_geometry(xs, ys, elev_water):
+    """Get the flow area, wet perimeter and surface width of an irregular section below a water
+    surface.
+
+    Walks the vertices of :meth:`pyflo.sections.Irregular.flow_vertices` once, without building
+    them, summing the shoelace formula and the segment lengths in the same order. The surface
+    spans from the first vertex to the last. Where it can't be intersected, over the level
+    segment joining the last point to the first, the results are nan.
+
+    Args:
+        xs (numpy.ndarray): The stations of the ground line points, in :math:`feet`.
+        ys (numpy.ndarray): The elevations of the ground line points, in :math:`feet`.
+        elev_water (float): The water surface elevation, in :math:`feet`.
+
+    Returns:
+        Tuple[float, float, float]: Area, in :math:`feet^2`, wet perimeter and surface width, in
+            :math:`feet`.
+
+    """
+    area = 0.0
+    perimeter = 0.0
+    x_first = y_first = x_prev = y_prev = 0.0
+    started = False
+    for i in range(xs.size):
+        x1 = xs[i - 1]
+        y1 = ys[i - 1]
+        x2 = xs[i]
+        y2 = ys[i]
+        if not started:
+            if not y2 < elev_water:
+                continue
+            if y2 == y1:                                                    # Above the banks
+                return np.nan, np.nan, np.nan
+            x_prev = x_first = (elev_water-y1) * (x2-x1) / (y2-y1) + x1     # Intersection at left
+            y_prev = y_first = elev_water
+            started = True
+        right = y2 > elev_water
+        if right:                                                           # Intersection at right
+            x2 = (elev_water-y1) * (x2-x1) / (y2-y1) + x1
+            y2 = elev_water
+        area += x_prev * y2
+        area -= x2 * y_prev
+        perimeter += math.hypot(x2 - x_prev, y2 - y_prev)
+        x_prev = x2
+        y_prev = y2
+        if right:
+            break
+    area += x_prev * y_first
+    area -= x_first * y_prev
+    return abs(area) / 2.0, perimeter, abs(x_prev - x_first)
+
+
+@jit
+def irregular_geometries(xs, ys, elevs_water):
+    """Get the flow areas, wet perimeters and surface widths of an irregular section below many
+    water surfaces.
+
+    Args:
+        xs (numpy.ndarray): The stations of the ground line points, in :math:`feet`.
+        ys (numpy.ndarray): The elevations of the ground line points, in :math:`feet`.
+        elevs_water (numpy.ndarray): The water surface elevations, in :math:`feet`.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Areas, in :math:`feet^2`, wet
+            perimeters and surface widths, in :math:`feet`.
+
+    """
+    areas = np.empty(elevs_water.size)
+    perimeters = np.empty(elevs_water.size)
+    widths = np.empty(elevs_water.size)
+    for i in range(elevs_water.size):
+        areas[i], perimeters[i], widths[i] = irregular_geometry(xs, ys, elevs_water[i])
+    return areas, perimeters, widths
+
+
+@jit
+def normal_flow(depth, shape, k_velocity):
+    """Kernel of :meth:`pyflo.links.Reach.normal_flow`."""
+    a_f, p_w, _ = geometry(shape, depth)
+    r_h = a_f / p_w if p_w > 0.0 else 0.0
+    return a_f * k_velocity * np.cbrt(r_h * r_h)
+
+
+@jit
+def friction_slope(depth, shape, flow, k_friction):
+    """Kernel of :meth:`pyflo.links.Reach.friction_slope`."""
+    a_f, p_w, _ = geometry(shape, depth)
+    r_h = a_f / p_w if p_w > 0.0 else 0.0
+    vel = flow / a_f
+    return max(vel * vel * k_friction / (r_h * np.cbrt(r_h)), 0.0)
+
+
+@jit
+def normal_depth_accuracy(depth, shape, args):
+    """Kernel of :meth:`pyflo.links.Reach.normal_depth_accuracy`; args is (k_velocity, flow)."""
+    k_velocity, flow = args
+    return normal_flow(depth, shape, k_velocity) - flow
+
+
+@jit
+def critical_depth_accuracy(depth, shape, args):
+    """Kernel of :meth:`pyflo.links.Reach.critical_depth_accuracy`; args is (flow**2,)."""
+    flow_sq = args[0]
+    a_f, _, w_s = geometry(shape, depth)
+    return constants.G * a_f * a_f * a_f - w_s * flow_sq
+
+
+@jit
+def weir_depth_accuracy(depth, shape, args):
+    """Kernel of :meth:`pyflo.links.Weir.normal_depth_accuracy` for sections without a rise.
+
+    Args is (k_weir, flow); the projection of such sections is their surface width.
+
+    """
+    k_weir, flow = args
+    _, _, w_s = geometry(shape, depth)
+    return k_weir * w_s * depth * math.sqrt(depth) - flow
+
+
+@jit
+def weir_flow(stage_1, stage_2, shape, args):
+    """Kernel of :meth:`pyflo.links.Weir.flow`.
+
+    Args is (invert, k_weir, y_top, y_ctr, k_flow), where the orifice terms y_top, y_ctr and
+    k_flow are nan for sections without a rise.
+
+    """
+    invert, k_weir, y_top, y_ctr, k_flow = args
+    flow = 0.0
+    if not math.isnan(k_flow):
+        if stage_1 > y_top:                                                         # orifice flow
+            if stage_2 < invert:                                                    # free flow
+                h_eff = stage_1 - y_ctr
+            else:                                                                   # submerged flow
+                h_eff = stage_1 - stage_2
+            if h_eff < 0.0:
+                raise ValueError('math domain error')                               # as math.sqrt
+            flow = k_flow * math.sqrt(h_eff)
+    elif stage_1 > invert:                                                          # weir flow
+        depth = stage_1 - invert
+        _, _, w_s = geometry(shape, depth)
+        flow = k_weir * w_s * depth * math.sqrt(depth)
+        if stage_2 > invert:                                                        # submerged flow
+            flow *= 1.0 - (stage_2/stage_1)**0.5775
+    return flow
+
+
+@jit
+def stage_1_accuracy(stage_1, shape, args):
+    """Upstream energy balance of :meth:`pyflo.links.Reach.stage_1`.
+
+    Args is (invert_1, flow, e_lower, h_f2, h_m2, length, k_friction, k_minor), where e_lower,
+    h_f2 and h_m2 are the downstream energy, friction loss and minor loss.
+
+    """
+    invert_1, flow, e_lower, h_f2, h_m2, length, k_friction, k_minor = args
+    depth = stage_1 - invert_1
+    a_f, _, _ = geometry(shape, depth)
+    vel = flow / a_f
+    h_v = vel * vel / TWO_G
+    h_f1 = length * friction_slope(depth, shape, flow, k_friction)
+    h_m1 = k_minor * vel * vel / TWO_G
+    h_f = (h_f1+h_f2) / 2.0
+    h_m = (h_m1+h_m2) / 2.0
+    return invert_1 + depth + h_v - (e_lower+h_f+h_m)
+
+
+@jit
+def contour_area(stages, areas, stage):
+    """Kernel of :meth:`pyflo.routing.Reservoir.area`.
+
+    Args:
+        stages (numpy.ndarray): The contour elevations, in ascending order, in :math:`feet`.
+        areas (numpy.ndarray): The contour areas, in :math:`feet^2`.
+        stage (float): An elevation, in :math:`feet`.
+
+    Returns:
+        float: Area, in :math:`feet^2`, interpolated as :class:`scipy.interpolate.interp1d` does,
+            extrapolated above the contours, or nan below them.
+
+    """
+    count = stages.size
+    if count < 2:
+        raise ValueError('x and y arrays must have at least 2 entries')
+    if stage < stages[0]:
+        return np.nan
+    if stage <= stages[-1]:
+        return np.interp(stage, stages, areas)
+    slope = (areas[-1]-areas[-2]) / (stages[-1]-stages[-2])
+    return slope * (stage-stages[-2]) + areas[-2]
+
+
+@jit
+def storage(stages, areas, volumes, stage):
+    """Kernel of :meth:`pyflo.routing.Reservoir.storage`.
+
+    Args:
+        stages (numpy.ndarray): The contour elevations, in ascending order, in :math:`feet`.
+        areas (numpy.ndarray): The contour areas, in :math:`feet^2`.
+        volumes (numpy.ndarray): The storage at each contour, in :math:`feet^3`.
+        stage (float): An elevation, in :math:`feet`.
+
+    Returns:
+        float: Volume, in :math:`feet^3`, the storage at the contour below plus the trapezoid up
+            to the elevation.
+
+    """
+    if not stages.size or not stage > stages[0]:
+        return 0.0
+    below = np.searchsorted(stages, stage) - 1
+    area = contour_area(stages, areas, stage)
+    return volumes[below] + (area+areas[below]) / 2.0 * (stage-stages[below])
+
+
+@jit
+def storage_stage(stages, areas, volumes, volume):
+    """Find the elevation where the storage of a reservoir is a volume.
+
+    The area varies linearly between contours, so the storage above the contour below is a
+    quadratic of the elevation, solved in closed form.
+
+    Args:
+        stages (numpy.ndarray): The contour elevations, in ascending order, in :math:`feet`.
+        areas (numpy.ndarray): The contour areas, in :math:`feet^2`.
+        volumes (numpy.ndarray): The storage at each contour, in :math:`feet^3`.
+        volume (float): In :math:`feet^3`.
+
+    Returns:
+        float: Elevation, in :math:`feet`.
+
+    Raises:
+        ValueError: If the volume is not within the storage of the contours.
+
+    """
+    if not volumes[0] <= volume <= volumes[-1]:
+        raise ValueError('The volume is not within the storage of the contours')
+    i = np.searchsorted(volumes, volume)
+    if i == 0:
+        return stages[0]
+    area = areas[i - 1]
+    slope = (areas[i]-area) / (stages[i]-stages[i - 1])
+    delta = volume - volumes[i - 1]
+    # The root of slope/2 * h**2 + area * h - delta, without cancellation for small slopes
+    return stages[i - 1] + 2.0*delta / (area + math.sqrt(max(area*area + 2.0*slope*delta, 0.0)))
+
+
+@jit
+def route_accuracy(stage, shape, args):
+    """Kernel of :meth:`pyflo.routing.Analysis.stage_accuracy` for a weir.
+
+    Args is (stages, areas, volumes, weir_args, tw, inflow_1, inflow, outflow_1, storage_1,
+    interval), where stages, areas and volumes are the contours upstream, empty without a
+    reservoir, and weir_args are the args of :func:`weir_flow`.
+
+    """
+    stages, areas, volumes, weir_args, tw, inflow_1, inflow, outflow_1, storage_1, interval = args
+    storage_2 = storage(stages, areas, volumes, stage)
+    outflow_2 = weir_flow(stage, tw, shape, weir_args)
+    inflow_ave = (inflow_1+inflow) / 2.0
+    outflow_ave = (outflow_1+outflow_2) / 2.0
+    storage_delta_1 = storage_2 - storage_1
+    storage_delta_2 = (inflow_ave-outflow_ave) * interval * 60.0 * 60.0
+    return storage_delta_1 - storage_delta_2
+
+
+@jit
+def route(out, steps, interval, tw, rating_stages, shapes, weir_args, offsets, stages, areas,
+          volumes, downstream, to_outlet):
+    """Route weirs over time, as :meth:`pyflo.routing.Analysis.node_solution_results` does.
+
+    Args:
+        out (numpy.ndarray): The (time, inflow, outflow, storage, stage) results of each link at
+            each time step, with the first step filled in. Filled in place.
+        steps (int): The number of time steps after the first.
+        interval (float): In :math:`hours`.
+        tw (float): The elevation at the outlet, in :math:`feet`.
+        rating_stages (numpy.ndarray): The stages bracketing the solved stages, from the lowest
+            to the highest routed stage, in :math:`feet`.
+        shapes (numpy.ndarray): The kernel shape of the section of each link.
+        weir_args (numpy.ndarray): The args of :func:`weir_flow` for each link.
+        offsets (numpy.ndarray): Where the contours of each link start in stages, areas and
+            volumes, and where they end for the last link. Links without a reservoir have no
+            contours.
+        stages (numpy.ndarray): The contour elevations of every link, in :math:`feet`.
+        areas (numpy.ndarray): The contour areas of every link, in :math:`feet^2`.
+        volumes (numpy.ndarray): The storage at the contours of every link, in :math:`feet^3`.
+        downstream (numpy.ndarray): The index of the downstream link of each link, or -1.
+        to_outlet (numpy.ndarray): Whether each link ends at the outlet.
+
+    """
+    count = out.shape[0]
+    size = rating_stages.size
+    filled = np.ones(count, dtype=np.int64)
+    rated = np.zeros(count, dtype=np.bool_)
+    rating_tws = np.empty(count)
+    rating_flows = np.empty((count, size))
+    rating_storages = np.empty((count, size))
+    for j in range(count):
+        start, end = offsets[j], offsets[j + 1]
+        for k in range(size):
+            rating_storages[j, k] = storage(
+                stages[start:end], areas[start:end], volumes[start:end], rating_stages[k]
+            )
+    for i in range(1, steps + 1):
+        time = i * interval
+        for j in range(count):
+            shape = (shapes[j, 0], shapes[j, 1], shapes[j, 2], shapes[j, 3], shapes[j, 4])
+            weir = (weir_args[j, 0], weir_args[j, 1], weir_args[j, 2], weir_args[j, 3],
+                    weir_args[j, 4])
+            link_stages = stages[offsets[j]:offsets[j + 1]]
+            link_areas = areas[offsets[j]:offsets[j + 1]]
+            link_volumes = volumes[offsets[j]:offsets[j + 1]]
+            ds = downstream[j]
+            tw_flow = out[ds, filled[ds] - 1, 4] if ds >= 0 else tw
+            tw_stage = tw if to_outlet[j] else tw_flow
+            if not rated[j]:  # For the first tailwater, which changes every step below a link
+                invert, y_top = weir[0], weir[2]
+                for k in range(size):
+                    stage_k = rating_stages[k]
+                    if y_top < stage_k < tw_stage and tw_stage >= invert:  # Negative head
+                        rating_flows[j, k] = np.nan
+                    else:
+                        rating_flows[j, k] = weir_flow(stage_k, tw_stage, shape, weir)
+                rating_tws[j] = tw_stage
+                rated[j] = True
+            last = filled[j] - 1
+            inflow_1 = out[j, last, 1]
+            outflow_1 = out[j, last, 2]
+            storage_1 = out[j, last, 3]
+            args = (link_stages, link_areas, link_volumes, weir, tw_stage, inflow_1, 0.0,
+                    outflow_1, storage_1, interval)  # No inflow, see Analysis._compiled
+            inflow_ave = inflow_1 / 2.0
+            above = -1
+            for k in range(size if rating_tws[j] == tw_stage else 0):
+                if math.isnan(rating_flows[j, k]):  # Bisect, as the residual is unknown here
+                    break
+                outflow_ave = (outflow_1+rating_flows[j, k]) / 2.0
+                storage_delta = (inflow_ave-outflow_ave) * interval * 60.0 * 60.0
+                if (rating_storages[j, k]-storage_1) - storage_delta > 0.0:
+                    above = k
+                    break
+            stage = np.nan
+            if above > 0:
+                try:
+                    stage = _route_brentq(rating_stages[above - 1], rating_stages[above], shape,
+                                          args)
+                except Exception:  # The residual rounded to the other sign at a rating stage
+                    pass
+            if math.isnan(stage):
+                stage = _route_bisect(rating_stages[0], rating_stages[-1], shape, args)
+            storage_2 = storage(link_stages, link_areas, link_volumes, stage)
+            outflow = weir_flow(stage, tw_flow, shape, weir)
+            out[j, i, 0] = time
+            out[j, i, 1] = 0.0
+            out[j, i, 2] = outflow
+            out[j, i, 3] = storage_2
+            out[j, i, 4] = stage
+            filled[j] = i + 1
+            if ds >= 0 and offsets[ds + 1] > offsets[ds]:
+                ds_stages = stages[offsets[ds]:offsets[ds + 1]]
+                ds_areas = areas[offsets[ds]:offsets[ds + 1]]
+                ds_volumes = volumes[offsets[ds]:offsets[ds + 1]]
+                ds_last = filled[ds] - 1
+                ds_storage = out[ds, ds_last, 3] + outflow * interval * 60.0 * 60.0
+                out[ds, ds_last, 3] = ds_storage
+                out[ds, ds_last, 4] = storage_stage(ds_stages, ds_areas, ds_volumes, ds_storage)
+
+
+def _bisect_of(f):
+    """Bind :func:`bisect` to a kernel, so compiled functions can call it and still be cached."""
+    @jit(cache=False)
+    def solve(xa, xb, shape, args):
+        fa = f(xa, shape, args)
+        fb = f(xb, shape, args)
+        if fa * fb > 0.0:
+            raise ValueError('f(a) and f(b) must have different signs')
+        if fa == 0.0:
+            return xa
+        if fb == 0.0:
+            return xb
+        dm = xb - xa
+        for _ in range(MAX_ITER):
+            dm *= 0.5
+            xm = xa + dm
+            fm = f(xm, shape, args)
+            if fm * fa >= 0.0:
+                xa = xm
+            if fm == 0.0 or abs(dm) < XTOL + RTOL*abs(xm):
+                return xm
+        raise RuntimeError('Failed to converge')
+    return solve
+
+
+def _brentq_of(f):
+    """Bind :func:`brentq` to a kernel, so compiled functions can call it and still be cached."""
+    @jit(cache=False)
+    def solve(xa, xb, shape, args):
+        xpre = xa
+        xcur = xb
+        xblk = 0.0
+        fblk = 0.0
+        spre = 0.0
+        scur = 0.0
+        fpre = f(xpre, shape, args)
+        fcur = f(xcur, shape, args)
+        if fpre == 0.0:
+            return xpre
+        if fcur == 0.0:
+            return xcur
+        if (fpre < 0.0) == (fcur < 0.0):
+            raise ValueError('f(a) and f(b) must have different signs')
+        for _ in range(MAX_ITER):
+            if fpre != 0.0 and fcur != 0.0 and (fpre < 0.0) != (fcur < 0.0):
+                xblk = xpre
+                fblk = fpre
+                spre = scur = xcur - xpre
+            if abs(fblk) < abs(fcur):
+                xpre, xcur, xblk = xcur, xblk, xcur
+                fpre, fcur, fblk = fcur, fblk, fcur
+            delta = (XTOL + RTOL*abs(xcur)) / 2.0
+            sbis = (xblk-xcur) / 2.0
+            if fcur == 0.0 or abs(sbis) < delta:
+                return xcur
+            if abs(spre) > delta and abs(fcur) < abs(fpre):
+                if xpre == xblk:                                                       # interpolate
+                    stry = -fcur * (xcur-xpre) / (fcur-fpre)
+                else:                                                                  # extrapolate
+                    dpre = (fpre-fcur) / (xpre-xcur)
+                    dblk = (fblk-fcur) / (xblk-xcur)
+                    stry = -fcur * (fblk*dblk - fpre*dpre) / (dblk * dpre * (fblk-fpre))
+                if 2.0*abs(stry) < min(abs(spre), 3.0*abs(sbis) - delta):              # short step
+                    spre = scur
+                    scur = stry
+                else:                                                                  # bisect
+                    spre = sbis
+                    scur = sbis
+            else:                                                                      # bisect
+                spre = sbis
+                scur = sbis
+            xpre = xcur
+            fpre = fcur
+            if abs(scur) > delta:
+                xcur += scur
+            else:
+                xcur += delta if sbis > 0.0 else -delta
+            fcur = f(xcur, shape, args)
+        raise RuntimeError('Failed to converge')
+    return solve
+
+
+_solvers = {}  # Bound solvers, by binder and kernel
+
+
+def _solver(binder, f):
+    solve = _solvers.get((binder, f))
+    if solve is None:
+        solve = _solvers[binder, f] = binder(f)
+    return solve
+
+
+def bisect(f, xa, xb, shape, args):
+    """Find a root of a kernel function in a bracketing interval, by bisection.
+
+    A port of :func:`scipy.optimize.bisect`, with its default tolerances, and the arguments of
+    :func:`brentq`.
+
+    """
+    return _solver(_bisect_of, f)(xa, xb, shape, args)
+
+
+def brentq(f, xa, xb, shape, args):
+    """Find a root of a kernel function in a bracketing interval, with Brent's method.
+
+    A port of :func:`scipy.optimize.brentq`, with its default tolerances.
+
+    Args:
+        f: A compiled kernel, called as `f(x, shape, args)`.
+        xa (float): One end of the bracketing interval.
+        xb (float): The other end of the bracketing interval.
+        shape (Tuple[float, float, float, float, float]): The kernel shape of the section.
+        args (tuple): Additional arguments of f.
+
+    Returns:
+        float: The root.
+
+    Raises:
+        ValueError: If f(xa) and f(xb) do not have different signs.
+        RuntimeError: If the root did not converge.
+
+    """
+    return _solver(_brentq_of, f)(xa, xb, shape, args)
+
+
+_route_brentq = _solver(_brentq_of, route_accuracy)
+_route_bisect = _solver(_bisect_of, route_accuracy)
@@ -5,16 +5,169 @@
 
 """
 
+import collections
 import math
+import struct
 from typing import Tuple
 
+import numpy as np
 from scipy import optimize
 
-from pyflo import constants, sections
+from pyflo import constants, kernels, sections
+
+try:
+    from math import cbrt
+except ImportError:  # Python < 3.11
+    def cbrt(x):
+        return math.copysign(abs(x)**(1.0/3.0), x)
+
+_TRIAL_DEPTHS = 2.0**np.arange(100)  # Candidate upper bounds when goal seeking a depth
+_TRIAL_DEPTH_LIST = _TRIAL_DEPTHS.tolist()
+_GRID_SIZE = 512  # Depths per rise of closed sections, when narrowing a bracket
+_MEMO_SIZE = 4096  # Solved depths remembered per reach, least recently used are dropped first
+_TWO_G = 2.0 * constants.G
+_SQRT_TWO_G = math.sqrt(_TWO_G)
+_K_MANNING_SQ = constants.K_MANNING * constants.K_MANNING
+
+
+def _memoized(memo, flow, solve):
+    """Get a solution from a least recently used memo, solving and remembering it if missing.
+
+    Args:
+        memo (collections.OrderedDict): Solutions by flow.
+        flow (float): Flow, in :math:`feet^3/second`.
+        solve: Called as `solve(flow)` if the flow is not in the memo.
+
+    Returns:
+        float: The solution.
+
+    """
+    value = memo.get(flow)
+    if value is None:
+        value = memo[flow] = solve(flow)
+        if len(memo) > _MEMO_SIZE:
+            memo.popitem(last=False)
+    else:
+        memo.move_to_end(flow)
+    return value
+
+
+def _bisect_bits(func, a, b):
+    """Find a root of a function between two positive floats, bisecting their bit patterns.
+
+    Positive floats order the same as their bit patterns, so halving the patterns between the
+    bounds halves the floats left to try, and any bracket is resolved to adjacent floats within
+    64 evaluations.
+
+    Args:
+        func: Called as `func(x)`.
+        a (float): The positive lower bound.
+        b (float): The upper bound.
+
+    Returns:
+        float: The root, or whichever adjacent bounding float has the smaller residual.
+
+    Raises:
+        ValueError: If func(a) and func(b) do not have different signs.
+
+    """
+    f_a = func(a)
+    f_b = func(b)
+    if f_a == 0.0:
+        return a
+    if f_b == 0.0:
+        return b
+    if (f_a < 0.0) == (f_b < 0.0):
+        raise ValueError('f(a) and f(b) must have different signs')
+    bits_a = struct.unpack('<q', struct.pack('<d', a))[0]
+    bits_b = struct.unpack('<q', struct.pack('<d', b))[0]
+    while bits_b - bits_a > 1:
+        bits_m = (bits_a+bits_b) // 2
+        m = struct.unpack('<d', struct.pack('<q', bits_m))[0]
+        f_m = func(m)
+        if f_m == 0.0:
+            return m
+        if (f_m < 0.0) == (f_a < 0.0):
+            a, f_a, bits_a = m, f_m, bits_m
+        else:
+            b, f_b, bits_b = m, f_m, bits_m
+    return a if abs(f_a) < abs(f_b) else b
+
+
+def _chandrupatla(func, a, b):
+    """Find the roots of many functions in their brackets at once, with Chandrupatla's method.
+
+    Every iteration evaluates the residuals of the unresolved intervals together, so solving many
+    intervals costs about as many array evaluations as solving one. Each interval converges to
+    the tolerances of :func:`scipy.optimize.brentq`.
+
+    Args:
+        func: Called as `func(x, index)`, returning the residuals at x of the functions at index.
+        a (numpy.ndarray): One end of each bracketing interval.
+        b (numpy.ndarray): The other end of each bracketing interval.
+
+    Returns:
+        numpy.ndarray: The roots.
+
+    Raises:
+        ValueError: If the residuals at the ends of an interval do not have different signs.
+        RuntimeError: If a root did not converge.
+
+    """
+    x_1 = np.asarray(a, dtype=float)
+    x_2 = np.asarray(b, dtype=float)
+    index = np.arange(x_1.size)
+    f_1 = func(x_1, index)
+    f_2 = func(x_2, index)
+    if np.any(((f_1 < 0.0) == (f_2 < 0.0)) & (f_1 != 0.0) & (f_2 != 0.0)):
+        raise ValueError('f(a) and f(b) must have different signs')
+    roots = np.where(f_1 == 0.0, x_1, x_2)
+    active = (f_1 != 0.0) & (f_2 != 0.0)
+    x_1, x_2, f_1, f_2, index = x_1[active], x_2[active], f_1[active], f_2[active], index[active]
+    t = np.full(index.size, 0.5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(kernels.MAX_ITER):
+            if not index.size:
+                return roots
+            x_t = x_1 + t*(x_2-x_1)
+            f_t = func(x_t, index)
+            same = (f_t < 0.0) == (f_1 < 0.0)
+            x_3 = np.where(same, x_1, x_2)
+            f_3 = np.where(same, f_1, f_2)
+            x_2 = np.where(same, x_2, x_1)
+            f_2 = np.where(same, f_2, f_1)
+            x_1 = x_t
+            f_1 = f_t
+            best = np.abs(f_1) < np.abs(f_2)
+            x_m = np.where(best, x_1, x_2)
+            f_m = np.where(best, f_1, f_2)
+            t_l = (kernels.XTOL + kernels.RTOL*np.abs(x_m)) / 2.0 / np.abs(x_2-x_1)
+            done = (t_l > 0.5) | (f_m == 0.0)
+            roots[index[done]] = x_m[done]
+            xi = (x_1-x_2) / (x_3-x_2)
+            phi = (f_1-f_2) / (f_3-f_2)
+            inverse_quadratic = (phi*phi < xi) & ((1.0-phi) * (1.0-phi) < 1.0 - xi)
+            t = np.where(
+                inverse_quadratic,
+                (f_1 / (f_2-f_1) * f_3 / (f_2-f_3) +
+                 (x_3-x_1) / (x_2-x_1) * f_1 / (f_3-f_1) * f_2 / (f_3-f_2)),
+                0.5
+            )
+            t = np.clip(t, t_l, 1.0 - t_l)
+            keep = ~done
+            x_1, x_2, x_3, t = x_1[keep], x_2[keep], x_3[keep], t[keep]
+            f_1, f_2, f_3, index = f_1[keep], f_2[keep], f_3[keep], index[keep]
+    if index.size:
+        raise RuntimeError('Failed to converge')
+    return roots
 
 
 class Link(object):
 
+    # Named attributes are stored in slots for fast access during network traversal and solving.
+    # The __dict__ slot keeps arbitrary attributes (such as display names) assignable.
+    __slots__ = ('_node_2', 'node_1', '__dict__')
+
     def __init__(self, **kwargs):
         self._node_2 = None
         self.node_1 = kwargs.pop('node_1', None)
@@ -42,33 +195,93 @@ class Link(object):
     def normal_depth(self, flow):
         pass
 
+    def clear_solutions(self):
+        pass
+
 
 class Weir(Link):
 
+    __slots__ = ('_invert', '_k_orif', 'k_weir', '_section', '_orifice')
+
     def __init__(self, invert, k_orif, k_weir, section, **kwargs):
         super(Weir, self).__init__(**kwargs)
-        self.invert = invert
-        self.k_orif = k_orif
+        self._orifice = None                        # Orifice elevations and flow coefficient
+        self._invert = invert
+        self._k_orif = k_orif
         self.k_weir = k_weir
-        self.section = section
+        self._section = section
+
+    def clear_solutions(self):
+        """Forget the cached orifice terms.
+
+        Note:
+            Called automatically when the invert, orifice coefficient or section are assigned.
+            Call directly after modifying the dimensions of the assigned section in place.
+
+        """
+        self._orifice = None
+
+    @property
+    def invert(self):
+        return self._invert
+
+    @invert.setter
+    def invert(self, value):
+        self._invert = value
+        self.clear_solutions()
+
+    @property
+    def k_orif(self):
+        return self._k_orif
+
+    @k_orif.setter
+    def k_orif(self, value):
+        self._k_orif = value
+        self.clear_solutions()
+
+    @property
+    def section(self):
+        return self._section
+
+    @section.setter
+    def section(self, value):
+        self._section = value
+        self.clear_solutions()
+
+    def _orifice_terms(self):
+        """Get the top and center elevations of the opening, and the orifice flow per root head.
+
+        Returns:
+            tuple: (y_top, y_ctr, k_flow), or an empty tuple if the section has no rise.
+
+        """
+        if self._orifice is None:
+            rise = self.section.rise
+            if rise:
+                area = self.section.flow_area(rise)
+                k_flow = self.k_orif * area * _SQRT_TWO_G
+                self._orifice = (self.invert + rise, self.invert + rise / 2.0, k_flow)
+            else:
+                self._orifice = ()
+        return self._orifice
 
     def flow(self, stage_1, stage_2):
         flow = 0.0
-        if self.section.rise:
-            y_top = self.invert + self.section.rise
-            y_ctr = self.invert + self.section.rise / 2.0
+        invert = self._invert
+        orifice = self._orifice_terms()
+        if orifice:
+            y_top, y_ctr, k_flow = orifice
             if stage_1 > y_top:                                                     # orifice flow
-                if stage_2 < self.invert:                                           # free flow
+                if stage_2 < invert:                                                # free flow
                     h_eff = stage_1 - y_ctr
                 else:                                                               # submerged flow
                     h_eff = stage_1 - stage_2
-                area = self.section.flow_area(self.section.rise)
-                flow = self.k_orif * area * math.sqrt(2.0 * 32.2 * h_eff)
-        elif stage_1 > self.invert:                                                 # weir flow
-            depth = stage_1 - self.invert
-            flow = self.k_weir * self.section.projection(depth) * depth**1.5
-            if stage_2 > self.invert:                                               # submerged flow
-                flow *= 1.0 - ((stage_2/stage_1)**1.5)**0.385
+                flow = k_flow * math.sqrt(h_eff)
+        elif stage_1 > invert:                                                      # weir flow
+            depth = stage_1 - invert
+            flow = self.k_weir * self._section.projection(depth) * depth * math.sqrt(depth)
+            if stage_2 > invert:                                                    # submerged flow
+                flow *= 1.0 - (stage_2/stage_1)**0.5775                             # (1.5 * 0.385)
         return flow
 
     def section_time(self, depth, flow):
@@ -80,15 +293,20 @@ class Weir(Link):
         return q_h - flow
 
     def normal_depth(self, flow):
-        if self.section.rise:
-            stage_1 = self.section.rise + self.invert
-            q_h = self.flow(stage_1, self.invert)
+        rise = self._section.rise
+        if rise:
+            stage_1 = rise + self._invert
+            q_h = self.flow(stage_1, self._invert)
             if flow / q_h > 1.0:
-                return self.section.rise
-        for i in range(1, 100):
-            depth_trial = i
+                return rise
+        for depth_trial in _TRIAL_DEPTH_LIST:
             if self.normal_depth_accuracy(depth_trial, flow) > 1.0:
-                depth = optimize.bisect(
+                shape = self._section.kernel_shape if kernels.ENABLED and not rise else None
+                if shape:
+                    return kernels.brentq(
+                        kernels.weir_depth_accuracy, 1e-12, depth_trial, shape, (self.k_weir, flow)
+                    )
+                depth = optimize.brentq(
                     f=self.normal_depth_accuracy,
                     a=1e-12,
                     b=depth_trial,
@@ -100,6 +318,11 @@ class Weir(Link):
 
 class Reach(Link):
 
+    __slots__ = (
+        '_normal_depths', '_critical_depths', '_k_velocity', '_k_friction', '_trials', '_drop',
+        '_slope_derived', '_sqrt_g_length', '_slope', '_inverts', '_length', '_section', 'k_minor'
+    )
+
     def __init__(self, section, slope=None, inverts=None, length=None, k_minor=None, **kwargs):
         """A link between two nodes with hydraulic attributes, dimensions, and methods.
 
@@ -114,12 +337,66 @@ class Reach(Link):
 
         """
         super(Reach, self).__init__(**kwargs)
+        self._normal_depths = collections.OrderedDict()     # Solved normal depth, by flow
+        self._critical_depths = collections.OrderedDict()   # Solved critical depth, by flow
+        self._k_velocity = None                     # Manning velocity per r_h**(2/3)
+        self._k_friction = None                     # Friction slope per (vel/r_h**(2/3))**2
+        self._trials = {}                           # Values at each of the trial depths
+        self._drop = None                           # Derived from inverts or slope and length
+        self._slope_derived = None                  # Derived from drop and length
+        self._sqrt_g_length = None                  # Froude number denominator
         self._slope = slope
         self._inverts = inverts
         self._length = length
-        self.section = section
+        self._section = section
         self.k_minor = k_minor
 
+    def clear_solutions(self):
+        """Forget the memoized normal and critical depths, and the cached Manning coefficients.
+
+        Note:
+            Called automatically when the section, slope, inverts or length are assigned. Call
+            directly after modifying the dimensions of the assigned section in place.
+
+        """
+        self._normal_depths.clear()
+        self._critical_depths.clear()
+        self._k_velocity = None
+        self._k_friction = None
+        self._trials.clear()
+        self._drop = None
+        self._slope_derived = None
+        self._sqrt_g_length = None
+
+    @property
+    def k_velocity(self):
+        """float: The Manning constant, roughness and slope terms of the velocity equation."""
+        if self._k_velocity is None:
+            self._k_velocity = constants.K_MANNING * self.slope**0.5 / self.section.n
+        return self._k_velocity
+
+    @property
+    def k_friction(self):
+        """float: The Manning constant and roughness terms of the friction slope equation."""
+        if self._k_friction is None:
+            self._k_friction = self.section.n * self.section.n / _K_MANNING_SQ
+        return self._k_friction
+
+    def _kernel_shape(self):
+        """Get the shape of the section for the compiled kernels, if they can be used."""
+        if kernels.ENABLED:
+            return self.section.kernel_shape
+        return None
+
+    @property
+    def section(self):
+        return self._section
+
+    @section.setter
+    def section(self, value):
+        self._section = value
+        self.clear_solutions()
+
     @property
     def length(self):
         if self._length:
@@ -129,15 +406,20 @@ class Reach(Link):
     @length.setter
     def length(self, value):
         self._length = value
+        self.clear_solutions()
 
     @property
     def drop(self):
-        if self.inverts:
-            return self.inverts[0] - self.inverts[1]
-        elif self.slope and self.length:
-            return self.slope * self.length
-        else:
-            raise AttributeError('If inverts not defined, both slope and length must be defined.')
+        if self._drop is None:
+            if self.inverts:
+                self._drop = self.inverts[0] - self.inverts[1]
+            elif self.slope and self.length:
+                self._drop = self.slope * self.length
+            else:
+                raise AttributeError(
+                    'If inverts not defined, both slope and length must be defined.'
+                )
+        return self._drop
 
     @property
     def inverts(self):
@@ -148,19 +430,25 @@ class Reach(Link):
     @inverts.setter
     def inverts(self, value):
         self._inverts = value
+        self.clear_solutions()
 
     @property
     def slope(self):
         if self._slope:
             return self._slope
-        elif self.inverts and self.length:
-            return self.drop / self.length
-        else:
-            raise AttributeError('If slope not defined, both inverts and length must be defined.')
+        elif self._slope_derived is None:
+            if self.inverts and self.length:
+                self._slope_derived = self.drop / self.length
+            else:
+                raise AttributeError(
+                    'If slope not defined, both inverts and length must be defined.'
+                )
+        return self._slope_derived
 
     @slope.setter
     def slope(self, value):
         self._slope = value
+        self.clear_solutions()
 
     def velocity(self, depth):
         """Get the velocity of a partial flow section, given a depth from the invert.
@@ -173,7 +461,7 @@ class Reach(Link):
 
         """
         r_h = self.section.hyd_radius(depth)
-        return constants.K_MANNING * r_h**(2.0/3.0) * self.slope ** 0.5 / self.section.n
+        return self.k_velocity * cbrt(r_h * r_h)
 
     def normal_flow(self, depth):
         """Get the flow of a partial flow section, given a depth from the invert.
@@ -185,10 +473,38 @@ class Reach(Link):
             float: Hydraulic flow, in :math:`feet^3/second`.
 
         """
+        shape = self._kernel_shape()
+        if shape:
+            return kernels.normal_flow(depth, shape, self.k_velocity)
         a_f = self.section.flow_area(depth)
         vel = self.velocity(depth)
         return a_f * vel
 
+    def velocities(self, depths):
+        """Get the velocities of partial flow sections for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): In :math:`feet`.
+
+        Returns:
+            numpy.ndarray: Velocities, in :math:`feet/second`.
+
+        """
+        r_h = self.section.hyd_radii(depths)
+        return self.k_velocity * np.cbrt(r_h * r_h)
+
+    def normal_flows(self, depths):
+        """Get the flows of partial flow sections for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): In :math:`feet`.
+
+        Returns:
+            numpy.ndarray: Hydraulic flows, in :math:`feet^3/second`.
+
+        """
+        return self.section.flow_areas(depths) * self.velocities(depths)
+
     def froude_number(self, velocity):
         """Get the froude number, used to compare if flow is sub- or super-critical.
 
@@ -199,8 +515,9 @@ class Reach(Link):
             float: A dimensionless number for comparing against critical depth.
 
         """
-        b = math.sqrt(constants.G * self.length)
-        return velocity / b
+        if self._sqrt_g_length is None:
+            self._sqrt_g_length = math.sqrt(constants.G * self.length)
+        return velocity / self._sqrt_g_length
 
     def profile_classification(self, flow, depth=None):
         d_n = self.normal_depth(flow)
@@ -262,9 +579,7 @@ class Reach(Link):
         """
         a_f = self.section.flow_area(depth)
         w_s = self.section.surface_width(depth)
-        a = w_s * flow**2.0
-        b = constants.G * a_f**3.0
-        return b - a
+        return constants.G * a_f * a_f * a_f - w_s * flow * flow
 
     def critical_depth(self, flow):
         """Goal seek a the critical depth in a open flow case.
@@ -276,23 +591,45 @@ class Reach(Link):
             float: the depth where critical flow occurs, in :math:`feet`.
 
         """
+        return _memoized(self._critical_depths, flow, self._critical_depth)
+
+    def _critical_depth(self, flow):
+        flow_sq = flow * flow
+        grid_residuals = None
         if self.section.rise:
             bound_upper = self.section.rise
+            if not self._kernel_shape():
+                if 'critical_grid' not in self._trials:
+                    depths = self._grid_depths()
+                    a_f = self.section.flow_areas(depths)
+                    w_s = self.section.surface_widths(depths)
+                    self._trials['critical_grid'] = (constants.G * a_f * a_f * a_f, w_s)
+                g_a_cubed, w_s = self._trials['critical_grid']
+                grid_residuals = g_a_cubed - w_s * flow_sq
         else:
             bound_upper = None
-            for i in range(100):
-                depth_trial = i
-                if self.critical_depth_accuracy(depth_trial, flow) > 1.0:
-                    bound_upper = depth_trial
-                    break
+            if 'critical' not in self._trials:
+                depths = self._trial_depths()
+                a_f = self.section.flow_areas(depths)
+                w_s = self.section.surface_widths(depths)
+                self._trials['critical'] = (constants.G * a_f * a_f * a_f, w_s)
+            g_a_cubed, w_s = self._trials['critical']
+            trials_above = np.flatnonzero(g_a_cubed - w_s * flow_sq > 1.0)
+            if trials_above.size:
+                bound_upper = self._trial_depths()[trials_above[0]]
         if bound_upper:
-            depth = optimize.bisect(
-                f=self.critical_depth_accuracy,
-                a=1e-12,
-                b=bound_upper,
-                args=(flow,)
+            # Bound once, as the residual is evaluated at every step of the solver
+            flow_area = self.section.flow_area
+            surface_width = self.section.surface_width
+            g = constants.G
+
+            def accuracy(depth):
+                a_f = flow_area(depth)
+                return g * a_f * a_f * a_f - surface_width(depth) * flow_sq
+
+            return self._solve_depth(
+                kernels.critical_depth_accuracy, (flow_sq,), accuracy, bound_upper, grid_residuals
             )
-            return float(depth)
         raise Exception('Maximum iterations reached while trying to find an upper bound')
 
     def critical_velocity(self, flow):
@@ -322,8 +659,8 @@ class Reach(Link):
         v_c = self.critical_velocity(flow)
         r_h = self.section.hyd_radius(d_c)
         a = v_c * self.section.n
-        b = constants.K_MANNING * r_h**(2.0/3.0)
-        return (a / b) ** 2.0
+        b = constants.K_MANNING * cbrt(r_h * r_h)
+        return (a/b) * (a/b)
 
     def friction_slope(self, depth, flow):
         """Get the water surface grade, based on frictional properties.
@@ -336,11 +673,14 @@ class Reach(Link):
             float: The slope of the water surface profile, in :math:`feet/feet`.
 
         """
+        shape = self._kernel_shape()
+        if shape:
+            return kernels.friction_slope(depth, shape, flow, self.k_friction)
         a_f = self.section.flow_area(depth)
         vel = flow / a_f
         r_h = self.section.hyd_radius(depth)
-        a = vel**2.0 * self.section.n**2.0
-        b = constants.K_MANNING**2.0 * r_h**(4.0/3.0)
+        a = vel * vel * self.k_friction
+        b = r_h * cbrt(r_h)
         return max(a / b, 0.0)
 
     def friction_loss(self, depth, flow):
@@ -370,7 +710,7 @@ class Reach(Link):
         if self.k_minor:
             a_f = self.section.flow_area(depth)
             vel = flow / a_f
-            return self.k_minor * vel**2.0 / 2.0 / constants.G
+            return self.k_minor * vel * vel / _TWO_G
         return 0.0
 
     def section_time(self, depth, flow):
@@ -415,23 +755,156 @@ class Reach(Link):
             The goal is to find a 1:1 ratio of hydraulic to hydrology flow.
 
         """
+        return _memoized(self._normal_depths, flow, self._normal_depth)
 
-        if self.section.rise:
-            q_h = self.normal_flow(self.section.rise)
-            if flow / q_h > 1.0:
-                return self.section.rise
-        for i in range(1, 100):
-            depth_trial = i
-            if self.normal_depth_accuracy(depth_trial, flow) > 1.0:
-                depth = optimize.bisect(
-                    f=self.normal_depth_accuracy,
-                    a=1e-12,
-                    b=depth_trial,
-                    args=(flow,)
-                )
-                return float(depth)
+    def normal_depths(self, flows):
+        """Goal seek the depths in a open flow case for many flows.
+
+        Args:
+            flows (numpy.ndarray): Flows, in :math:`feet^3/second`.
+
+        Returns:
+            numpy.ndarray: Depths, in :math:`feet`.
+
+        Note:
+            The flows without a memoized depth are solved together, rather than one at a time.
+
+        """
+        flows = np.ravel(flows).astype(float).tolist()
+        memo = self._normal_depths
+        unsolved = list(collections.OrderedDict.fromkeys(f for f in flows if f not in memo))
+        solved = {}
+        if unsolved:
+            solved = dict(zip(unsolved, self._batch_normal_depths(np.array(unsolved)).tolist()))
+            memo.update(solved)
+            while len(memo) > _MEMO_SIZE:
+                memo.popitem(last=False)
+        return np.array([
+            solved[flow] if flow in solved else _memoized(memo, flow, self._normal_depth)
+            for flow in flows
+        ], dtype=float)
+
+    def _batch_normal_depths(self, flows):
+        depths = np.empty_like(flows)
+        partial = np.ones(flows.size, dtype=bool)
+        rise = self.section.rise
+        if rise:
+            if 'full' not in self._trials:
+                self._trials['full'] = self.normal_flow(rise)
+            partial = ~(flows / self._trials['full'] > 1.0)
+            depths[~partial] = rise
+        if 'normal_flows' not in self._trials:
+            self._trials['normal_flows'] = self.normal_flows(self._trial_depths())
+        flows = flows[partial]
+        trials_above = self._trials['normal_flows'] - flows[:, np.newaxis] > 1.0
+        if not trials_above.any(axis=1).all():
+            raise Exception('Maximum iterations reached while trying to find an upper bound')
+        bounds_upper = self._trial_depths()[np.argmax(trials_above, axis=1)]
+
+        def accuracy(depths, index):
+            return self.normal_flows(depths) - flows[index]
+
+        depths[partial] = _chandrupatla(accuracy, np.full(flows.size, 1e-12), bounds_upper)
+        return depths
+
+    def _normal_depth(self, flow):
+        rise = self.section.rise
+        if rise:
+            if 'full' not in self._trials:
+                self._trials['full'] = self.normal_flow(rise)
+            if flow / self._trials['full'] > 1.0:
+                return rise
+        if 'normal_flows' not in self._trials:
+            self._trials['normal_flows'] = self.normal_flows(self._trial_depths())
+        trials_above = np.flatnonzero(self._trials['normal_flows'] - flow > 1.0)
+        if trials_above.size:
+            grid_residuals = None
+            if rise and not self._kernel_shape():
+                if 'normal_grid' not in self._trials:
+                    self._trials['normal_grid'] = self.normal_flows(self._grid_depths())
+                grid_residuals = self._trials['normal_grid'] - flow
+            # Bound once, as the residual is evaluated at every step of the solver
+            k_velocity = self.k_velocity
+            flow_area = self.section.flow_area
+            hyd_radius = self.section.hyd_radius
+
+            def accuracy(depth):
+                r_h = hyd_radius(depth)
+                return flow_area(depth) * (k_velocity * cbrt(r_h * r_h)) - flow
+
+            return self._solve_depth(
+                kernels.normal_depth_accuracy, (k_velocity, flow), accuracy,
+                self._trial_depths()[trials_above[0]], grid_residuals
+            )
         raise Exception('Maximum iterations reached while trying to find an upper bound')
 
+    def _trial_depths(self, depths=_TRIAL_DEPTHS):
+        """Get the trial depths below the top of the section, and the top itself.
+
+        The geometry of an open section with a top, such as :class:`pyflo.sections.Irregular`,
+        is undefined above it.
+
+        Args:
+            depths (numpy.ndarray): The trial depths, in ascending order, in :math:`feet`.
+
+        Returns:
+            numpy.ndarray: The trial depths, in :math:`feet`.
+
+        """
+        max_depth = self.section.max_depth
+        if max_depth:
+            return np.append(depths[depths < max_depth], max_depth)
+        return depths
+
+    def _grid_depths(self):
+        # Evenly spaced depths up to the rise of a closed section, for narrowing brackets
+        if 'grid' not in self._trials:
+            self._trials['grid'] = np.linspace(0.0, self.section.rise, _GRID_SIZE + 1)[1:]
+        return self._trials['grid']
+
+    def _solve_depth(self, kernel, kernel_args, func, bound_upper, grid_residuals=None):
+        """Find the depth where a residual changes sign, from negative to positive.
+
+        When residuals at the grid depths are given, the solver starts from the grid interval
+        where the sign changes, rather than from zero to the upper bound. This pays off only for
+        the scipy solver; the compiled kernels are cheaper than the array comparisons.
+
+        Args:
+            kernel: The compiled residual, used when the section has a kernel shape.
+            kernel_args (tuple): Additional arguments of the kernel.
+            func: The residual, called as `func(depth)`.
+            bound_upper (float): The upper bound of the depth, in :math:`feet`.
+            grid_residuals (numpy.ndarray): The residuals at the grid depths.
+
+        Returns:
+            float: The depth, in :math:`feet`.
+
+        """
+        shape = self._kernel_shape()
+
+        def solve(bound_lower, bound_upper):
+            try:
+                if shape:
+                    return kernels.brentq(kernel, bound_lower, bound_upper, shape, kernel_args)
+                return float(optimize.brentq(func, bound_lower, bound_upper))
+            except RuntimeError:  # Brent's method ran out of iterations on a very wide bracket
+                if shape:
+                    return _bisect_bits(
+                        lambda depth: kernel(depth, shape, kernel_args), bound_lower, bound_upper
+                    )
+                return _bisect_bits(func, bound_lower, bound_upper)
+
+        if grid_residuals is not None:
+            depths = self._trials['grid']
+            above = (grid_residuals > 0.0) & (depths <= bound_upper)
+            i = int(np.argmax(above))
+            if above[i]:
+                try:
+                    return solve(depths[i - 1] if i else 1e-12, depths[i])
+                except ValueError:  # The scalar residual rounded to the other sign at a grid depth
+                    pass
+        return solve(1e-12, bound_upper)
+
     def velocity_loss(self, depth, flow):
         """Get the vertical head caused by velocity flowing through a reach.
 
@@ -445,7 +918,7 @@ class Reach(Link):
         """
         a_f = self.section.flow_area(depth)
         vel = flow / a_f
-        return vel**2.0 / 2.0 / constants.G
+        return vel * vel / _TWO_G
 
     def hgl_2(self, stage_2, flow):
         """Get the hydraulic elevation at the downstream end.
@@ -510,10 +983,10 @@ class Reach(Link):
 
         """
         # y_2 = stage_2 - self.invert_2
-        y_2 = stage_2 - self.inverts[1]
-        h_v = self.velocity_loss(y_2, flow)
         # z_2 = self.invert_2
         z_2 = self.inverts[1]
+        y_2 = stage_2 - z_2
+        h_v = self.velocity_loss(y_2, flow)
         h_f1 = self.friction_loss(depth, flow)
         h_f2 = self.friction_loss(y_2, flow)
         h_f = (h_f1+h_f2) / 2.0
@@ -551,40 +1024,68 @@ class Reach(Link):
             float: The depth where steady state condition occurs.
 
         """
+        invert_1, invert_2 = self.inverts
         # d_lower = stage_2 - self.invert_2
-        d_lower = stage_2 - self.inverts[1]
+        d_lower = stage_2 - invert_2
         d_crit = self.critical_depth(flow)
+
+        # Only the upstream depth changes while goal seeking, so the downstream end terms of
+        # energy_2 are evaluated once.
+        e_lower = invert_2 + d_lower + self.velocity_loss(d_lower, flow)
+        h_f2 = self.friction_loss(d_lower, flow)
+        h_m2 = self.minor_loss(d_lower, flow)
+
+        shape = self._kernel_shape()
+        if shape:
+            k_minor = self.k_minor if self.k_minor else 0.0
+            args = (invert_1, flow, e_lower, h_f2, h_m2, self.length, self.k_friction, k_minor)
+
+            def accuracy(stage_1):
+                return kernels.stage_1_accuracy(stage_1, shape, args)
+
+            def solve(a, b):
+                return kernels.brentq(kernels.stage_1_accuracy, a, b, shape, args)
+        else:
+            # Bound once, as the residual is evaluated at every step of the solver
+            length = self.length
+            k_friction = self.k_friction
+            k_minor = self.k_minor if self.k_minor else 0.0
+            flow_area = self.section.flow_area
+            hyd_radius = self.section.hyd_radius
+
+            def accuracy(stage_1):
+                depth = stage_1 - invert_1
+                vel = flow / flow_area(depth)
+                r_h = hyd_radius(depth)
+                h_v = vel * vel / _TWO_G
+                h_f1 = length * max(vel * vel * k_friction / (r_h * cbrt(r_h)), 0.0)
+                h_m1 = k_minor * vel * vel / _TWO_G
+                h_f = (h_f1+h_f2) / 2.0
+                h_m = (h_m1+h_m2) / 2.0
+                return invert_1 + depth + h_v - (e_lower+h_f+h_m)
+
+            def solve(a, b):
+                return optimize.brentq(f=accuracy, a=a, b=b)
+
         # bound_a = self.invert_1 + 1e-12
-        bound_a = self.inverts[0] + 1e-12
+        bound_a = invert_1 + 1e-12
         # bound_b = self.invert_1 + d_crit
-        bound_b = self.inverts[0] + d_crit
+        bound_b = invert_1 + d_crit
         bound_c = None
+        rise = self.section.rise
+        d_step = rise if rise else 1
         for i in range(1, 100):
-            d_trial = i
-            if self.section.rise:
-                d_trial *= self.section.rise
-            # hw_trial = self.invert_1 + d_trial
-            hw_trial = self.inverts[0] + d_trial
-            if self.stage_1_accuracy(hw_trial, stage_2, flow) > 1.0:
+            hw_trial = invert_1 + i*d_step
+            if accuracy(hw_trial) > 1.0:
                 bound_c = hw_trial
                 break
         bounds_1 = (bound_a, bound_b) if d_lower < d_crit else (bound_b, bound_c)
         bounds_2 = (bound_b, bound_c) if d_lower < d_crit else (bound_a, bound_b)
         if bound_c:
             try:
-                hw = optimize.bisect(
-                    f=self.stage_1_accuracy,
-                    a=bounds_1[0],
-                    b=bounds_1[1],
-                    args=(stage_2, flow)
-                )
+                hw = solve(bounds_1[0], bounds_1[1])
             except ValueError:
-                hw = optimize.bisect(
-                    f=self.stage_1_accuracy,
-                    a=bounds_2[0],
-                    b=bounds_2[1],
-                    args=(stage_2, flow)
-                )
+                hw = solve(bounds_2[0], bounds_2[1])
             return float(hw)
         raise Exception('Maximum iterations reached while trying to find an upper bound')
 
@@ -598,17 +1099,32 @@ class Reach(Link):
     def flow(self, stage_1, stage_2):
         # hw = max(stage_1, stage_2)
         # tw = min(stage_1, stage_2)
-        for i in range(1, 100):
-            d_trial = i
-            if self.section.rise:
-                d_trial *= self.section.rise
-            q_trial = self.normal_flow(d_trial)
-            if self.flow_accuracy(q_trial, stage_1, stage_2) > 1.0:
-                flow = optimize.bisect(
-                    f=self.flow_accuracy,
-                    a=1e-12,
-                    b=q_trial,
-                    args=(stage_1, stage_2)
-                )
-                return float(flow)
+
+        # The depths at each end are fixed and every head term is proportional to flow**2, so the
+        # terms are evaluated once for a unit flow and scaled while goal seeking the flow.
+        invert_1, invert_2 = self.inverts
+        depth = stage_1 - invert_1
+        y_2 = stage_2 - invert_2
+        h_f = (self.friction_loss(depth, 1.0)+self.friction_loss(y_2, 1.0)) / 2.0
+        h_m = (self.minor_loss(depth, 1.0)+self.minor_loss(y_2, 1.0)) / 2.0
+        k_head = self.velocity_loss(depth, 1.0) - self.velocity_loss(y_2, 1.0) - h_f - h_m
+        h_static = stage_1 - stage_2
+
+        def accuracy(flow):
+            return h_static + k_head * flow * flow
+
+        # The normal flows at 1 to 99 rises, up to the top of the section, are the trial upper
+        # bounds, and one brackets the flow if its balance is over a foot. The balance is
+        # monotonic in flow, so only the extreme trial flows are checked.
+        if 'flow' not in self._trials:
+            rise = self.section.rise
+            q_trials = self.normal_flows(
+                self._trial_depths(np.arange(1.0, 100.0) * (rise if rise else 1.0))
+            )
+            self._trials['flow'] = (np.nanmin(q_trials), np.nanmax(q_trials))
+        if any(accuracy(q_trial) > 1.0 for q_trial in self._trials['flow']):
+            # The balance is quadratic in flow, so the bracketed root has a closed form
+            if accuracy(1e-12) > 0.0:
+                raise ValueError('f(a) and f(b) must have different signs')
+            return math.sqrt(-h_static / k_head)
         raise Exception('Maximum iterations reached while trying to find an upper bound')
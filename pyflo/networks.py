@@ -13,6 +13,9 @@ from pyflo import links, sections, basins
 
 class Node(object):
 
+    # See links.Link, named attributes are slots and arbitrary attributes remain assignable.
+    __slots__ = ('network', 'reach', 'links', 'basin', 'reservoir', '__dict__')
+
     def __init__(self, network):
         """A point where a :class:`Basin`, :class:`Reach`, or :class:`Reservoir` can be assigned.
 
@@ -46,6 +49,7 @@ class Node(object):
         reach = links.Reach(section, slope, inverts, length, k_minor, node_1=self, node_2=node_2)
         self.reach = reach
         self.links.append(reach)
+        self._invalidate()
         return reach
 
     def create_weir(self, node_2, invert, k_orif, k_weir, section):
@@ -64,6 +68,7 @@ class Node(object):
         """
         weir = links.Weir(invert, k_orif, k_weir, section, node_1=self, node_2=node_2)
         self.links.append(weir)
+        self._invalidate()
         return weir
 
     def add_reach(self, reach):
@@ -79,10 +84,12 @@ class Node(object):
         reach.node_1 = self
         self.links.append(reach)
         self.reach = reach
+        self._invalidate()
 
     def add_link(self, link):
         link.node_1 = self
         self.links.append(link)
+        self._invalidate()
 
     def add_basin(self, basin):
         """Assign a :class:`Basin` instance as a child of the node.
@@ -95,29 +102,110 @@ class Node(object):
 
         """
         self.basin = basin
+        self._invalidate(links=False, basins=True)
 
     def add_reservoir(self, reservoir):
         self.reservoir = reservoir
 
+    def _invalidate(self, links=True, basins=False):
+        if self.network is not None:
+            self.network._invalidate(links, basins)
+
 
 class Network(object):
 
     def __init__(self):
-        """A top level container for storing network components"""
+        """A top level container for storing network components
+
+        Note:
+            The links, reaches and basins of the nodes, and the links traced from a node, are
+            gathered once and kept until a node or component is added through the network and
+            node methods. Call :meth:`refresh` after
+            modifying :attr:`nodes` or a node's links directly. The gathered lists are shared, so
+            copy them before modifying.
+
+        """
         self.nodes = []
+        self._links = None
+        self._link_set = None
+        self._reaches = None
+        self._basins = None
+        self._traced = {}                           # Traced links, by trace function and node
+        self._sections = {}
+
+    def _invalidate(self, links=True, basins=True):
+        # Only the gathered lists of the kind of component added are forgotten
+        if links:
+            self._links = None
+            self._link_set = None
+            self._reaches = None
+            self._traced = {}
+        if basins:
+            self._basins = None
+
+    def refresh(self):
+        """Forget the gathered links, reaches and basins, so they are gathered again."""
+        self._invalidate()
 
     @property
     def links(self):
-        lists = [node.links for node in self.nodes]
-        return list(itertools.chain.from_iterable(lists))
+        if self._links is None:
+            lists = [node.links for node in self.nodes]
+            self._links = list(itertools.chain.from_iterable(lists))
+        return self._links
+
+    @property
+    def link_set(self):
+        """Set[pyflo.links.Link]: The links, for constant time membership tests."""
+        if self._link_set is None:
+            self._link_set = set(self.links)
+        return self._link_set
 
     @property
     def reaches(self):
-        return [node.reach for node in self.nodes if node.reach]
+        if self._reaches is None:
+            self._reaches = [node.reach for node in self.nodes if node.reach]
+        return self._reaches
 
     @property
     def basins(self):
-        return [node.basin for node in self.nodes if node.basin]
+        if self._basins is None:
+            self._basins = [node.basin for node in self.nodes if node.basin]
+        return self._basins
+
+    def traced_links(self, trace, node):
+        """Get the links traced from a node, tracing them once until links are added.
+
+        Args:
+            trace: A function of :mod:`pyflo.build` called as `trace(node, links)`, e.g.
+                :func:`pyflo.build.links_down_to_node`.
+            node (Node): The node to trace from.
+
+        Returns:
+            List[pyflo.links.Link]: The shared list of traced links.
+
+        """
+        key = trace, node
+        links = self._traced.get(key)
+        if links is None:
+            links = self._traced[key] = trace(node, self.links)
+        return links
+
+    def shared_section(self, section):
+        """Get the first section passed here with the same key, so equal sections are shared.
+
+        Args:
+            section (sections.Section): A cross sectional shape.
+
+        Returns:
+            sections.Section: The shared instance, which is the given section if it is the first
+                with its key.
+
+        Warning:
+            Modifying a shared section in place changes every reach it is assigned to.
+
+        """
+        return self._sections.setdefault(section.key, section)
 
     def create_node(self):
         """Create a new :class:`Node` instance and house it as a child of the network.
@@ -128,9 +216,11 @@ class Network(object):
         """
         node = Node(self)
         self.nodes.append(node)
+        self._invalidate()
         return node
 
     def add_node(self, node):
         """Add a :class:`Node` instance to the network and house it as a child of the network."""
         node.network = self
         self.nodes.append(node)
+        self._invalidate()
@@ -23,15 +23,62 @@ class Basin(basins.Basin):
             peak_factor (float): A value for scaling peak runoff.
 
         """
+        self._unit_hydrographs = {}                 # Unit hydrographs, by interval
         super(Basin, self).__init__(area)
         self.cn = cn
-        self.tc = tc
-        self.runoff_dist = runoff_dist
-        self.peak_factor = peak_factor
+        self._tc = tc
+        self._runoff_dist = runoff_dist
+        self._peak_factor = peak_factor
         shapes = kwargs.pop('shapes', None)
         if shapes:
             self.add_shapes(shapes)
 
+    def clear_solutions(self):
+        """Forget the cached unit hydrographs.
+
+        Note:
+            Called automatically when the area, tc, runoff distribution or peak factor are
+            assigned. Call directly after modifying the runoff distribution in place.
+
+        """
+        self._unit_hydrographs.clear()
+
+    @property
+    def area(self):
+        return self._area
+
+    @area.setter
+    def area(self, value):
+        self._area = value
+        self.clear_solutions()
+
+    @property
+    def tc(self):
+        return self._tc
+
+    @tc.setter
+    def tc(self, value):
+        self._tc = value
+        self.clear_solutions()
+
+    @property
+    def runoff_dist(self):
+        return self._runoff_dist
+
+    @runoff_dist.setter
+    def runoff_dist(self, value):
+        self._runoff_dist = value
+        self.clear_solutions()
+
+    @property
+    def peak_factor(self):
+        return self._peak_factor
+
+    @peak_factor.setter
+    def peak_factor(self, value):
+        self._peak_factor = value
+        self.clear_solutions()
+
     @property
     def potential_retention(self):
         return 1000.0/self.cn - 10.0
@@ -63,12 +110,28 @@ class Basin(basins.Basin):
             float: Runoff, in :math:`inches`.
 
         """
-        if rain_depth > self.initial_abstraction:
-            a = (rain_depth - self.initial_abstraction)**2.0
-            b = rain_depth - self.initial_abstraction + self.potential_retention
-            return a / b
+        excess = rain_depth - self.initial_abstraction
+        if excess > 0.0:
+            return excess * excess / (excess + self.potential_retention)
         return 0.0
 
+    def runoff_depths(self, rain_depths):
+        """Get the depths of runoff generated from many rainfall depths at once.
+
+        Args:
+            rain_depths (numpy.ndarray): In :math:`inches`.
+
+        Returns:
+            numpy.ndarray: Runoff, in :math:`inches`.
+
+        """
+        rain_depths = numpy.asarray(rain_depths, dtype=float)
+        excess = rain_depths - self.initial_abstraction
+        a = excess * excess
+        b = excess + self.potential_retention
+        runoff = numpy.zeros_like(excess)
+        return numpy.divide(a, b, out=runoff, where=excess > 0.0)
+
     def runoff_volume(self, rain_depth):
         """Get the volume of runoff generated from a defined rainfall and properties of the basin.
 
@@ -83,24 +146,19 @@ class Basin(basins.Basin):
         return runoff * self.area * 43560.0 / 12.0
 
     def runoff_depth_incremental(self, rain_depths, interval):
-        """Generate incremental amount of runoff generated from rainfall
+        """Get the incremental amounts of runoff generated from rainfall.
 
         Args:
             rain_depths (numpy.ndarray): A 2D array of scaled rainfall depths over time.
             interval (float): The amount of time the output will increment by.
 
-        Yields:
-            float: The next incremental amount of runoff generated from rainfall.
+        Returns:
+            numpy.ndarray: The incremental amount of runoff generated from rainfall, for each
+                interval.
 
         """
-        pairs = distributions.increment(rain_depths, interval).tolist()
-        for pair_1, pair_2 in zip(pairs, pairs[1:]):
-            time_1, rainfall_1 = pair_1
-            time_2, rainfall_2 = pair_2
-            runoff_1 = self.runoff_depth(rainfall_1)
-            runoff_2 = self.runoff_depth(rainfall_2)
-            runoff_delta = runoff_2 - runoff_1
-            yield runoff_delta
+        rainfall = distributions.increment(rain_depths, interval)[:, 1]
+        return numpy.diff(self.runoff_depths(rainfall))
 
     def unit_hydrograph(self, interval):
         """Get a hydrograph that represents the time-flow relationship per unit (inch) of depth.
@@ -111,9 +169,15 @@ class Basin(basins.Basin):
         Returns:
             numpy.ndarray: The hydrograph of potential basin runoff.
 
+        Note:
+            The hydrograph is cached by interval and shared, so copy it before modifying.
+
         """
-        hydrograph = self.runoff_dist * [self.peak_time, self.peak_runoff]
-        hydrograph = distributions.increment(hydrograph, interval)
+        hydrograph = self._unit_hydrographs.get(interval)
+        if hydrograph is None:
+            hydrograph = self.runoff_dist * [self.peak_time, self.peak_runoff]
+            hydrograph = distributions.increment(hydrograph, interval)
+            self._unit_hydrographs[interval] = hydrograph
         return hydrograph
 
     def flood_data(self, rain_depths, interval):
@@ -127,16 +191,16 @@ class Basin(basins.Basin):
             Tuple[float, float]: The next pair of time and runoff flow generated from rainfall.
 
         """
-        rd = self.unit_hydrograph(interval).tolist()
-        ri = list(self.runoff_depth_incremental(rain_depths, interval))
-        ri.reverse()  # Reversed list utilized for synthesis
-        comp_length = len(rd) + len(ri)
-        for i in range(comp_length - 1):
-            upper = i + 1
-            lower = max(upper - len(ri), 0)
-            total = sum(ri[j - upper] * rd[j][1] for j in range(lower, upper) if j < len(rd))
+        for i, total in enumerate(self._flood_totals(rain_depths, interval).tolist()):
             yield i * interval, total
 
+    def _flood_totals(self, rain_depths, interval):
+        rd = self.unit_hydrograph(interval)[:, 1]
+        ri = self.runoff_depth_incremental(rain_depths, interval)
+        if ri.size:
+            return numpy.convolve(rd, ri)  # Each runoff increment drives a unit hydrograph
+        return numpy.zeros(rd.size - 1)
+
     def flood_hydrograph(self, rain_depths, interval):
         """Get a composite hydrograph of basin runoff generated from rainfall over time.
 
@@ -148,9 +212,8 @@ class Basin(basins.Basin):
             numpy.ndarray: The composite hydrograph of runoff generated from rainfall.
 
         """
-        data = list(self.flood_data(rain_depths, interval))
-        hydrograph = numpy.array(data)
-        return hydrograph
+        totals = self._flood_totals(rain_depths, interval)
+        return numpy.column_stack((numpy.arange(totals.size) * interval, totals))
 
     @property
     def peak_time(self):
@@ -15,38 +15,36 @@ def plot_network_profile(network, link):
     Returns:
 
     """
-    if link not in network.links:
+    if link not in network.link_set:
         raise Exception('Link specified must be within the networks links.')
     lnks = build.links_down_from_node(link.node_1, network.links)
+    n_pts = sum(2 if isinstance(l, links.Reach) else 1 for l in lnks)
+    inverts = np.empty((n_pts, 2))
+    crowns = np.empty((len(lnks), 2, 2))
+    i = 0
+    n_crowns = 0
     x = 0.0
-    inverts = []
-    crowns = []
     for l in lnks:
         x1 = x
         if isinstance(l, links.Reach):
-            inverts.append((x, l.inverts[0]))
+            inverts[i] = x, l.inverts[0]
             x += l.length
-            inverts.append((x, l.inverts[1]))
+            inverts[i + 1] = x, l.inverts[1]
+            i += 2
         elif isinstance(l, links.Weir):
-            inverts.append((x, l.invert))
+            inverts[i] = x, l.invert
             x += 10.0  # Update this
+            i += 1
         else:
             raise Exception('Link is not valid.')
-        if l.section.rise:
-            crown = [
-                (x1, l.inverts[0] + l.section.rise),
-                (x, l.inverts[1] + l.section.rise)
-            ]
-            crowns.append(crown)
-    inverts = np.array(inverts)
-    x = inverts[:, 0]
-    y = inverts[:, 1]
-    pyplot.plot(x, y, 'k')
-    for crown in crowns:
-        pts = np.array(crown)
-        x = pts[:, 0]
-        y = pts[:, 1]
-        pyplot.plot(x, y, 'k')
+        rise = l.section.rise
+        if rise:
+            crowns[n_crowns] = (x1, l.inverts[0] + rise), (x, l.inverts[1] + rise)
+            n_crowns += 1
+    pyplot.plot(inverts[:, 0], inverts[:, 1], 'k')
+    if n_crowns:
+        crowns = crowns[:n_crowns]
+        pyplot.plot(crowns[:, :, 0].T, crowns[:, :, 1].T, 'k')  # One line per crown
 
     # pyplot.plot(x, y, 'bo')
     pyplot.title(r'Network Profile')
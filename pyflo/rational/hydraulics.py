@@ -5,11 +5,36 @@
 
 """
 
+import math
 from typing import Dict, Union
 from collections import OrderedDict
 
+import numpy as np
+
 from pyflo import build, constants, networks, distributions, links
 
+# The fields of each link of hydraulic results
+RESULT_DTYPE = np.dtype([
+    ('area', float), ('c', float), ('tc_local', float), ('tc_total', float), ('flow', float),
+    ('hgl_1', float), ('hgl_2', float)
+])
+
+
+def result_array(data):
+    """Get hydraulic results as an array, with a record for each link.
+
+    Args:
+        data (Dict[links.Link]): Results of :meth:`Analysis.hgl_solution_data`.
+
+    Returns:
+        numpy.ndarray: A structured array of :data:`RESULT_DTYPE`, in the order of the links in
+            data, so each field can be read for every link at once, e.g. `array['flow']`.
+
+    """
+    names = RESULT_DTYPE.names
+    records = [tuple(link_data[name] for name in names) for link_data in data.values()]
+    return np.array(records, dtype=RESULT_DTYPE)
+
 
 def totaled_basin_data(node):
     """Get cumulative basin data for each reach ordered downstream to the node.
@@ -23,20 +48,29 @@ def totaled_basin_data(node):
                 'c': float
             }
 
+    Note:
+        The totals are not cached, since basins are edited in place, e.g. by
+        :meth:`pyflo.rational.hydrology.Basin.add_shapes`. They cost a fraction of the
+        hydraulics of each link.
+
     """
-    o_links = build.links_down_to_node(node, links=node.network.links)
+    o_links = node.network.traced_links(build.links_down_to_node, node)
 
     # Accumulate c and area, top-down
     data = OrderedDict()
+    upstream = {}  # Links accumulated so far, by the node they end at
     for link in o_links:
-        area = link.node_1.basin.area if link.node_1.basin else 0.0
-        runoff = link.node_1.basin.runoff_area if link.node_1.basin else 0.0
-        for r, r_data in data.items():
-            if link.node_1 == r.node_2:
-                area += r_data['area']
-                runoff += r_data['area'] * r_data['c']
+        node_1 = link.node_1
+        basin = node_1.basin
+        area = basin.area if basin else 0.0
+        runoff = basin.runoff_area if basin else 0.0
+        for r in upstream.get(node_1, ()):
+            r_data = data[r]
+            area += r_data['area']
+            runoff += r_data['area'] * r_data['c']
         c = runoff / area
         data[link] = {'area': area, 'c': c}
+        upstream.setdefault(link.node_2, []).append(link)
     return data
 
 
@@ -80,38 +114,56 @@ class Analysis(object):
 
         """
         data = totaled_basin_data(self.node)
-        last_link = [link for link in self.node.network.links if link.node_2 == self.node][0]
-        # data[-1]['hgl_2'] = self.tw
-        data[last_link]['hgl_2'] = self.tw
-        for link, link_data in data.items():
-            tc = 0.0
-            if link.node_1.basin:
-                tc = link.node_1.basin.tc
-            for r, r_data in data.items():
-                if link.node_1 == r.node_2:
-                    if 'tc_total' in r_data and isinstance(r_data['tc_total'], float):
-                        tc = max(tc, r_data['tc_total'])
-            link_data['tc_local'] = tc
-            if isinstance(self.intensity, distributions.Evaluator):
-                i = self.intensity.get_y(tc / 60.0)
-            else:
-                i = self.intensity
+        o_links = list(data)
+        count = len(o_links)
+        # The positions of the links ending at, and starting from each node
+        by_node_2 = {}
+        by_node_1 = {}
+        for i, link in enumerate(o_links):
+            by_node_2.setdefault(link.node_2, []).append(i)
+            by_node_1.setdefault(link.node_1, []).append(i)
+        # The positions of the links above and below each link
+        upstream = [by_node_2.get(link.node_1, ()) for link in o_links]
+        downstream = [by_node_1.get(link.node_2, ()) for link in o_links]
+        # The fields of each link, by position. Not solved yet; max() keeps its first argument
+        # over nan
+        tc_locals = [0.0] * count
+        tc_totals = [math.nan] * count
+        flows = [0.0] * count
+        hgls_1 = [math.nan] * count
+        hgls_2 = [math.nan] * count
+        intensity = self.intensity
+        evaluated = isinstance(intensity, distributions.Evaluator)
+        # Accumulate flow and tc, top-down. Each link waits on the tc of the links above it, and
+        # its memoized normal depth takes microseconds, so the links are solved in order.
+        for i, (link, link_data) in enumerate(data.items()):
+            basin = link.node_1.basin
+            tc = basin.tc if basin else 0.0
+            for r in upstream[i]:
+                tc = max(tc, tc_totals[r])
+            tc_locals[i] = tc
+            i_rain = intensity.get_y(tc / 60.0) if evaluated else intensity
             ca = link_data['c'] * link_data['area']
-            flow = i * ca * constants.K_RATIONAL
+            flow = i_rain * ca * constants.K_RATIONAL
             depth = link.normal_depth(flow)
             ts = link.section_time(depth, flow)
-            link_data['flow'] = flow
-            link_data['tc_total'] = tc + ts
+            flows[i] = flow
+            tc_totals[i] = tc + ts
 
         # Trace back HGL, bottom-up
-        for link, link_data in reversed(data.items()):
+        for i in reversed(range(count)):
+            link = o_links[i]
             stage_2 = self.tw
-            for r, r_data in data.items():
-                if link.node_2 == r.node_1:
-                    if 'hgl_1' in r_data and isinstance(r_data['hgl_1'], float):
-                        stage_2 = max(stage_2, r_data['hgl_1'])
-            flow = link_data['flow']
-            link_data['hgl_2'] = link.hgl_2(stage_2, flow)
-            link_data['hgl_1'] = link.hgl_1(stage_2, flow)
-
+            for r in downstream[i]:
+                stage_2 = max(stage_2, hgls_1[r])
+            flow = flows[i]
+            hgls_2[i] = link.hgl_2(stage_2, flow)
+            hgls_1[i] = link.hgl_1(stage_2, flow)
+
+        for i, link_data in enumerate(data.values()):
+            link_data['tc_local'] = tc_locals[i]
+            link_data['tc_total'] = tc_totals[i]
+            link_data['flow'] = flows[i]
+            link_data['hgl_1'] = hgls_1[i]
+            link_data['hgl_2'] = hgls_2[i]
         return data
@@ -58,9 +58,7 @@ class Basin(basins.Basin):
             Tuple[float, float]: The next pair of time and runoff flow generated from rainfall.
 
         """
-        for time, rainfall in distributions.increment(rain_dist, interval).tolist():
-            intensity = rainfall / time
-            flow = intensity * self.runoff_area * constants.K_RATIONAL
+        for time, flow in self.flood_hydrograph(rain_dist, interval).tolist():
             yield time, flow
 
     def flood_hydrograph(self, rain_dist, interval):
@@ -74,6 +72,10 @@ class Basin(basins.Basin):
             numpy.ndarray: The composite hydrograph of runoff generated from rainfall.
 
         """
-        data = list(self.flood_data(rain_dist, interval))
-        hydrograph = numpy.array(data)
+        hydrograph = distributions.increment(rain_dist, interval)
+        times = hydrograph[:, 0]
+        if not times.all():
+            raise ZeroDivisionError('float division by zero')
+        intensities = hydrograph[:, 1] / times
+        hydrograph[:, 1] = intensities * self.runoff_area * constants.K_RATIONAL
         return hydrograph
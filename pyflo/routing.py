@@ -10,9 +10,67 @@ from typing import List, Tuple, Dict
 from collections import OrderedDict
 
 import numpy as np
-from scipy import optimize, interpolate
+from scipy import optimize
 
-from pyflo import build, links, networks
+from pyflo import build, kernels, links, networks
+
+_STAGE_RANGE = (16.0, 29.8)  # The range of routed stages, in feet
+_RATING_SIZE = 256  # Stage intervals of the link ratings, when bracketing a stage
+
+# The fields of each time step of routing results
+RESULT_DTYPE = np.dtype([
+    ('time', float), ('inflow', float), ('outflow', float), ('storage', float), ('stage', float)
+])
+
+
+def _bisect(func, a, b, args=()):
+    """Find a root of a Python function in a bracketing interval, by bisection.
+
+    A port of :func:`scipy.optimize.bisect`, with its default tolerances, that calls the function
+    directly rather than through scipy's C callback.
+
+    Raises:
+        ValueError: If func(a) and func(b) do not have different signs.
+        RuntimeError: If the root did not converge.
+
+    """
+    f_a = func(a, *args)
+    f_b = func(b, *args)
+    if f_a * f_b > 0.0:
+        raise ValueError('f(a) and f(b) must have different signs')
+    if f_a == 0.0:
+        return a
+    if f_b == 0.0:
+        return b
+    d_m = b - a
+    for _ in range(kernels.MAX_ITER):
+        d_m *= 0.5
+        x_m = a + d_m
+        f_m = func(x_m, *args)
+        if f_m * f_a >= 0.0:
+            a = x_m
+        if f_m == 0.0 or abs(d_m) < kernels.XTOL + kernels.RTOL*abs(x_m):
+            return x_m
+    raise RuntimeError('Failed to converge')
+
+
+def result_arrays(results):
+    """Get the data of routing results as arrays, with a record for each time step.
+
+    Args:
+        results (Dict[links.Link]): Results of :meth:`Analysis.node_solution_results`.
+
+    Returns:
+        Dict[links.Link]: A structured :class:`numpy.ndarray` of :data:`RESULT_DTYPE` for each
+            link, so each field can be read for every time step at once, e.g. `data['stage']`.
+
+    """
+    arrays = OrderedDict()
+    names = RESULT_DTYPE.names
+    for link, link_data in results.items():
+        records = [tuple(line[name] for name in names) for line in link_data['data']]
+        arrays[link] = np.array(records, dtype=RESULT_DTYPE)
+    return arrays
 
 
 class Tailwater(object):
@@ -30,8 +88,22 @@ class Tailwater(object):
         """
         if min(time_stage[0] for time_stage in time_stages) < 0.0:
             raise ValueError('Times in time_stages must all be positive numbers.')
+        self._times = None                          # Times, ascending
+        self._stages = None                         # Stages, by time
         self.time_stages = time_stages
 
+    @property
+    def time_stages(self):
+        return self._time_stages
+
+    @time_stages.setter
+    def time_stages(self, value):
+        self._time_stages = value
+        pairs = sorted(value, key=lambda time_stage: time_stage[0])
+        pairs = np.array(pairs, dtype=float).reshape(-1, 2)
+        self._times = pairs[:, 0]
+        self._stages = pairs[:, 1]
+
     def stage(self, time):
         """Get the elevation that corresponds to a time.
 
@@ -47,11 +119,7 @@ class Tailwater(object):
 
         """
         if self.time_stages:
-            pairs = sorted(self.time_stages, key=lambda time_stage: time_stage[0])
-            x_col, y_col = zip(*pairs)
-            fill_value = (y_col[0], y_col[-1])
-            y_interp = interpolate.interp1d(x_col, y_col, bounds_error=False, fill_value=fill_value)
-            return y_interp(time)
+            return np.interp(time, self._times, self._stages)
         return 0.0
 
 
@@ -67,12 +135,30 @@ class Reservoir(object):
                 in :math:`feet`.
 
         """
-        self.contours = sorted(contours, key=lambda contour: contour[0])
+        self._stages = None                         # Contour elevations, ascending
+        self._areas = None                          # Contour areas, by elevation
+        self._volumes = None                        # Storage at each contour
+        self.contours = contours
         if not start_stage:
             start_stage = self.contours[0][0]
         self.start_stage = start_stage
         self.node = kwargs.pop('node', None)
 
+    @property
+    def contours(self):
+        return self._contours
+
+    @contours.setter
+    def contours(self, value):
+        self._contours = sorted(value, key=lambda contour: contour[0])
+        pairs = np.array(self._contours, dtype=float).reshape(-1, 2)
+        self._stages = np.ascontiguousarray(pairs[:, 0])
+        self._areas = np.ascontiguousarray(pairs[:, 1])
+        self._volumes = np.zeros_like(self._stages)
+        self._volumes[1:] = np.cumsum(
+            (self._areas[1:]+self._areas[:-1]) / 2.0 * np.diff(self._stages)
+        )
+
     def area(self, stage):
         """Get an area that corresponds to the defined elevation.
 
@@ -87,11 +173,7 @@ class Reservoir(object):
 
         """
         if self.contours:
-            pairs = sorted(self.contours, key=lambda contour: contour[0])
-            x_col, y_col = zip(*pairs)
-            fill_value = 'extrapolate' if stage > x_col[-1] else np.nan
-            y_interp = interpolate.interp1d(x_col, y_col, fill_value=fill_value)
-            return y_interp(stage)
+            return kernels.contour_area(self._stages, self._areas, stage)
         return 0.0
 
     def storage(self, stage=None):
@@ -109,16 +191,7 @@ class Reservoir(object):
         """
         if not stage:
             stage = self.start_stage
-        storage = 0.0
-        if self.contours and stage > min(c[0] for c in self.contours):
-            pairs = [c for c in self.contours if c[0] < stage]
-            pairs.sort(key=lambda x: x[0])
-            pairs.append((stage, self.area(stage)))
-            for pair_1, pair_2 in zip(pairs, pairs[1:]):
-                stage_1, area_1 = pair_1
-                stage_2, area_2 = pair_2
-                storage += (area_2+area_1) / 2.0 * (stage_2-stage_1)
-        return storage
+        return kernels.storage(self._stages, self._areas, self._volumes, stage)
 
     def stage_accuracy(self, stage, storage):
         """Check solution convergence for stage's corresponding volume and storage.
@@ -144,16 +217,7 @@ class Reservoir(object):
 
         """
         if self.contours:
-            contours = sorted(self.contours, key=lambda x: x[0])
-            bound_1 = contours[0][0]
-            bound_2 = contours[-1][0]
-            stage = optimize.bisect(
-                f=self.stage_accuracy,
-                a=bound_1,
-                b=bound_2,
-                args=(storage,)
-            )
-            return stage
+            return kernels.storage_stage(self._stages, self._areas, self._volumes, storage)
         return self.start_stage
 
 
@@ -175,6 +239,10 @@ class Analysis(object):
         self.duration = duration                        # hours
         self.interval = interval                        # hours
         self.rain_dist = rain_dist
+        self._rating_stages = np.linspace(*_STAGE_RANGE, _RATING_SIZE + 1)
+        self._ratings = {}                              # First tailwater, outflows and storages
+        self._downstream = {}                           # Downstream link of each routed link
+        self._reservoirs = {}                           # Upstream reservoir of each routed link
 
     def init_node_solution_results(self):
         """
@@ -183,15 +251,18 @@ class Analysis(object):
             Dict[links.Link]
 
         """
-        o_links = build.links_up_from_node(self.node, self.node.network.links)
+        o_links = self.node.network.traced_links(build.links_up_from_node, self.node)
         results = OrderedDict()
+        self._reservoirs = {}
         for link in o_links:
+            node_1 = link.node_1
             hydrograph_data = None
-            if link.node_1.basin and self.rain_dist:
-                fh = link.node_1.basin.flood_hydrograph(self.rain_dist, self.interval)
+            if node_1.basin and self.rain_dist:
+                fh = node_1.basin.flood_hydrograph(self.rain_dist, self.interval)
                 hydrograph_data = fh.data
-            stage = link.node_1.reservoir.start_stage if link.node_1.reservoir else self.tw
-            storage = link.node_1.reservoir.storage(stage) if link.node_1.reservoir else 0.0
+            reservoir = self._reservoirs[link] = node_1.reservoir
+            stage = reservoir.start_stage if reservoir else self.tw
+            storage = reservoir.storage(stage) if reservoir else 0.0
             link_data = {
                 'hydrograph_data': hydrograph_data,
                 'data': [
@@ -199,6 +270,11 @@ class Analysis(object):
                 ]
             }
             results[link] = link_data
+        # The first link starting from the downstream node of each link, if any
+        by_node_1 = {}
+        for link in results:
+            by_node_1.setdefault(link.node_1, link)
+        self._downstream = {link: by_node_1.get(link.node_2) for link in results}
         return results
 
     def stage_accuracy(self, stage, inflow, link, results):
@@ -208,13 +284,9 @@ class Analysis(object):
         inflow_1 = line['inflow']
         outflow_1 = line['outflow']
         storage_1 = line['storage']
-        storage_2 = link.node_1.reservoir.storage(stage) if link.node_1.reservoir else 0.0
-        tw = self.tw
-        if link.node_2 != self.node:
-            for l, l_data in results.items():
-                if l.node_1 == link.node_2:
-                    tw = l[link]['data'][-1]['stage']
-                    break
+        reservoir = self._reservoirs[link]
+        storage_2 = reservoir.storage(stage) if reservoir else 0.0
+        tw = self._tailwater(link, results)
         outflow_2 = link.flow(stage, tw)
         inflow_ave = (inflow_1+inflow) / 2.0
         outflow_ave = (outflow_1+outflow_2) / 2.0
@@ -234,34 +306,149 @@ class Analysis(object):
             List[Dict]:
 
         """
-        stage = optimize.bisect(
-            f=self.stage_accuracy,
-            a=16.0,
-            b=29.8,
-            args=(inflow, link, results)
+        args = (inflow, link, results)
+        # The residuals at the rating stages bracket the stage within one interval, where Brent's
+        # method converges in a few steps
+        rating = self._rating(link, self._tailwater(link, results))
+        if rating is None:
+            return _bisect(self.stage_accuracy, *_STAGE_RANGE, args)
+        flows, storages = rating
+        line = results[link]['data'][-1]
+        inflow_ave = (line['inflow']+inflow) / 2.0
+        outflow_aves = (line['outflow']+flows) / 2.0
+        storage_deltas = (inflow_ave-outflow_aves) * self.interval * 60.0 * 60.0
+        residuals = (storages-line['storage']) - storage_deltas
+        above = residuals > 0.0
+        i = int(np.argmax(above))
+        if above[i] and i and not np.isnan(residuals[:i]).any():
+            try:
+                return optimize.brentq(
+                    f=self.stage_accuracy,
+                    a=self._rating_stages[i - 1],
+                    b=self._rating_stages[i],
+                    args=args
+                )
+            except ValueError:  # The scalar residual rounded to the other sign at a rating stage
+                pass
+        return _bisect(self.stage_accuracy, *_STAGE_RANGE, args)
+
+    def _tailwater(self, link, results):
+        # The stage at the downstream end of a link, from the link below it if there is one
+        ds_link = self._downstream.get(link)
+        if ds_link is not None and link.node_2 != self.node:
+            return results[ds_link]['data'][-1]['stage']
+        return self.tw
+
+    def _rating(self, link, tw):
+        """Get the outflows and storages of a link at the rating stages, for a tailwater.
+
+        The rating is built once per run, for the first tailwater of the link. The tailwater of
+        a link above another changes every step, so the rating is skipped for any other one.
+
+        Returns:
+            Optional[Tuple[numpy.ndarray, numpy.ndarray]]: The outflows, in
+                :math:`feet^3/second`, nan where they can't be evaluated, and the storages
+                upstream, in :math:`feet^3`; or None for another tailwater.
+
+        """
+        rating = self._ratings.get(link)
+        if rating is None:
+            stages = self._rating_stages.tolist()
+            flows = np.empty(len(stages))
+            for k, stage in enumerate(stages):
+                try:
+                    flows[k] = link.flow(stage, tw)
+                except ValueError:  # The stage is between the crown and a higher tailwater
+                    flows[k] = np.nan
+            reservoir = self._reservoirs[link]
+            storages = np.zeros_like(flows)
+            if reservoir:
+                storages[:] = [reservoir.storage(stage) for stage in stages]
+            rating = self._ratings[link] = (tw, flows, storages)
+        elif rating[0] != tw:
+            return None
+        return rating[1:]
+
+    def _compiled(self, results):
+        """Check whether :func:`pyflo.kernels.route` can route the results.
+
+        It routes weirs with a kernel shape, without inflow hydrographs, between reservoirs with
+        contours.
+
+        """
+        if not kernels.ENABLED:
+            return False
+        for link, link_data in results.items():
+            if not isinstance(link, links.Weir) or link.section.kernel_shape is None:
+                return False
+            if link_data['hydrograph_data'] is not None:
+                return False
+            reservoir = self._reservoirs[link]
+            if reservoir and not reservoir.contours:
+                return False
+        return True
+
+    def _route_compiled(self, results, time_steps):
+        """Route the results with :func:`pyflo.kernels.route`, as arrays indexed by link."""
+        o_links = list(results)
+        index = {link: i for i, link in enumerate(o_links)}
+        count = len(o_links)
+        shapes = np.array([link.section.kernel_shape for link in o_links], dtype=float)
+        weir_args = np.full((count, 5), np.nan)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        downstream = np.full(count, -1, dtype=np.int64)
+        to_outlet = np.zeros(count, dtype=np.bool_)
+        out = np.zeros((count, time_steps + 1, 5))
+        stages = []
+        areas = []
+        volumes = []
+        for i, link in enumerate(o_links):
+            weir_args[i, :2] = link.invert, link.k_weir
+            orifice = link._orifice_terms()
+            if orifice:
+                weir_args[i, 2:] = orifice
+            reservoir = self._reservoirs[link]
+            if reservoir:
+                stages.extend(reservoir._stages.tolist())
+                areas.extend(reservoir._areas.tolist())
+                volumes.extend(reservoir._volumes.tolist())
+            offsets[i + 1] = len(stages)
+            ds_link = self._downstream[link]
+            if ds_link is not None:
+                downstream[i] = index[ds_link]
+            to_outlet[i] = link.node_2 == self.node
+            line = results[link]['data'][0]
+            out[i, 0] = [line[name] for name in RESULT_DTYPE.names]
+        kernels.route(
+            out, time_steps, self.interval, self.tw, self._rating_stages, shapes, weir_args,
+            offsets, np.array(stages, dtype=float), np.array(areas, dtype=float),
+            np.array(volumes, dtype=float), downstream, to_outlet
         )
-        return stage
+        names = RESULT_DTYPE.names
+        for i, link in enumerate(o_links):
+            results[link]['data'] = [dict(zip(names, row)) for row in out[i].tolist()]
+        return results
 
     def node_solution_results(self):
+        self._ratings.clear()  # The links may have changed since the last run
         results = self.init_node_solution_results()
         time_steps = math.ceil(self.duration / self.interval)
+        if self._compiled(results):
+            return self._route_compiled(results, time_steps)
+        downstream = self._downstream
+        reservoirs = self._reservoirs
         for i in range(1, time_steps + 1):
             time = i * self.interval
             for link, link_data in results.items():
                 hydrograph_data = link_data['hydrograph_data']
                 inflow = hydrograph_data[i][1] if hydrograph_data else 0.0
                 stage = self.stage(inflow, link, results)
-
-                ds_query = [(k, k_data) for k, k_data in results.items() if k.node_1 == link.node_2]
-
-                if ds_query:
-                    ds_link, ds_data = ds_query[0]
-                    ds_line = ds_data[-1]
-                    tw = ds_line['stage']
-                else:
-                    tw = self.tw
-
-                storage = link.node_1.reservoir.storage(stage) if link.node_1.reservoir else 0.0
+                # The last time results below the link, both its tailwater and where it drains to
+                ds_link = downstream[link]
+                ds_line = results[ds_link]['data'][-1] if ds_link is not None else None
+                tw = ds_line['stage'] if ds_line is not None else self.tw
+                reservoir = reservoirs[link]
+                storage = reservoir.storage(stage) if reservoir else 0.0
                 outflow = link.flow(stage, tw)
                 line = {
                     'time': time,
@@ -271,11 +458,10 @@ class Analysis(object):
                     'stage': stage
                 }
                 link_data['data'].append(line)
-                if ds_query:
-                    ds_link, ds_data = ds_query[0]
-                    if ds_link.node_1.reservoir:
-                        ds_line = ds_data[-1]  # Last time results
+                if ds_line is not None:
+                    ds_reservoir = reservoirs[ds_link]
+                    if ds_reservoir:
                         ds_storage = ds_line['storage'] + outflow * self.interval * 60.0 * 60.0
                         ds_line['storage'] = ds_storage
-                        ds_line['stage'] = ds_link.node_1.reservoir.stage(ds_storage)
+                        ds_line['stage'] = ds_reservoir.stage(ds_storage)
         return results
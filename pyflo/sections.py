@@ -8,9 +8,16 @@
 import math
 from typing import List, Tuple
 
+import numpy as np
+
+from pyflo import kernels
+
 
 class Section(object):
 
+    # See links.Link, named attributes are slots and arbitrary attributes remain assignable.
+    __slots__ = ('count', 'n', '__dict__')
+
     def __init__(self, count=1, **kwargs):
         self.count = count
         self.n = kwargs.pop('n', None)
@@ -23,6 +30,24 @@ class Section(object):
     def rise(self, value):
         return
 
+    @property
+    def max_depth(self):
+        """float: The depth of the top of an open section, above which its geometry is undefined,
+        in :math:`feet`, or None if it has no top."""
+        return None
+
+    @property
+    def kernel_shape(self):
+        """Tuple[float, float, float, float, float]: The section dimensions, as used by
+        :mod:`pyflo.kernels`, or None if the shape has no compiled kernels."""
+        return None
+
+    @property
+    def key(self):
+        """tuple: The kind, dimensions, count and roughness of the section, equal for sections
+        that behave the same."""
+        return type(self).__name__, self.kernel_shape, self.count, self.n
+
     def hyd_radius(self, depth):
         """Get the hydraulic radius of flow, given a depth from the invert.
 
@@ -52,13 +77,115 @@ class Section(object):
     def projection(self, depth):
         pass
 
+    def hyd_radii(self, depths, dtype=float):
+        """Get the hydraulic radius of flow for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): Depths, in :math:`feet`.
+            dtype (numpy.dtype): The precision of the results.
+
+        Returns:
+            numpy.ndarray: Hydraulic radii, in :math:`feet`.
+
+        Note:
+            Shapes with NumPy geometry evaluate in the given dtype, so ``numpy.float32`` halves
+            the memory traffic of long sweeps, for about 6 significant digits.
+
+        """
+        p_w = self.wet_perimeters(depths, dtype)
+        a_f = self.flow_areas(depths, dtype)
+        r_h = np.zeros_like(p_w)
+        np.divide(a_f, p_w, out=r_h, where=~(p_w <= 0.0))  # nan stays nan
+        return r_h
+
+    def flow_areas(self, depths, dtype=float):
+        """Get the cross sectional area of flow for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): Depths, in :math:`feet`.
+            dtype (numpy.dtype): The precision of the results.
+
+        Returns:
+            numpy.ndarray: Areas, in :math:`feet^2`.
+
+        Note:
+            Evaluates :meth:`flow_area` for each depth, unless overridden by the shape.
+
+        """
+        return np.array(self._each(self.flow_area, depths), dtype=dtype)
+
+    def wet_perimeters(self, depths, dtype=float):
+        """Get the wet perimeter of flow for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): Depths, in :math:`feet`.
+            dtype (numpy.dtype): The precision of the results.
+
+        Returns:
+            numpy.ndarray: Wet perimeters, in :math:`feet`.
+
+        Note:
+            Evaluates :meth:`wet_perimeter` for each depth, unless overridden by the shape.
+
+        """
+        return np.array(self._each(self.wet_perimeter, depths), dtype=dtype)
+
+    def surface_widths(self, depths, dtype=float):
+        """Get the width of the water surface for many depths at once.
+
+        Args:
+            depths (numpy.ndarray): Depths, in :math:`feet`.
+            dtype (numpy.dtype): The precision of the results.
+
+        Returns:
+            numpy.ndarray: Surface widths, in :math:`feet`.
+
+        Note:
+            Evaluates :meth:`surface_width` for each depth, unless overridden by the shape.
+
+        """
+        widths = self._each(self.surface_width, depths)
+        return np.array([np.nan if w is None else w for w in widths], dtype=dtype)
+
+    def _each(self, func, depths):
+        """Evaluate a scalar method for each depth, as Python floats.
+
+        Depths above :attr:`max_depth` are nan rather than evaluated, as Python floats raise
+        where the geometry is undefined.
+
+        Args:
+            func: The scalar method, called as `func(depth)`.
+            depths (numpy.ndarray): Depths, in :math:`feet`.
+
+        Returns:
+            list: The values.
+
+        """
+        depths = np.ravel(depths).tolist()
+        max_depth = self.max_depth
+        if max_depth is None:
+            return [func(d) for d in depths]
+        return [func(d) if not d > max_depth else math.nan for d in depths]
+
 
 class Circle(Section):
 
+    __slots__ = ('_diameter', '_k_area', '_radius')
+
     def __init__(self, diameter, count=1, **kwargs):
         super(Circle, self).__init__(count, **kwargs)
         self.diameter = diameter
 
+    @property
+    def diameter(self):
+        return self._diameter
+
+    @diameter.setter
+    def diameter(self, value):
+        self._diameter = value
+        self._k_area = value * value / 8.0          # Area per radian of (alpha - sin(alpha))
+        self._radius = value / 2.0
+
     @property
     def rise(self):
         return self.diameter
@@ -67,6 +194,10 @@ class Circle(Section):
     def rise(self, value):
         self.diameter = value
 
+    @property
+    def kernel_shape(self):
+        return kernels.CIRCLE, self.diameter, 0.0, 0.0, self.count
+
     def flow_area(self, depth):
         """Get the cross sectional area of flow, given a depth from the invert.
 
@@ -77,9 +208,9 @@ class Circle(Section):
             float: Area, in :math:`feet^2`.
 
         """
-        d_calc = min(depth, self.diameter)
-        alpha = 2.0 * math.acos(1.0 - 2.0 * d_calc / self.diameter)
-        return self.count * self.diameter**2.0 / 8.0 * (alpha - math.sin(alpha))
+        d_calc = min(depth, self._diameter)
+        alpha = 2.0 * math.acos(1.0 - d_calc / self._radius)
+        return self.count * self._k_area * (alpha - math.sin(alpha))
 
     def wet_perimeter(self, depth):
         """Get the wet perimeter of flow, given a depth from the invert.
@@ -91,14 +222,21 @@ class Circle(Section):
             float: Wet perimeter, in :math:`feet`.
 
         """
-        d_calc = min(depth, self.diameter)
-        alpha = 2.0 * math.acos(1.0 - 2.0 * d_calc / self.diameter)
-        return self.count * alpha * self.diameter / 2.0
+        d_calc = min(depth, self._diameter)
+        alpha = 2.0 * math.acos(1.0 - d_calc / self._radius)
+        return self.count * alpha * self._radius
 
     def surface_width(self, depth):
-        d_calc = min(depth, self.diameter)
-        alpha = 2.0 * math.acos(1.0 - 2.0 * d_calc / self.diameter)
-        return self.count * self.diameter * math.sin(alpha / 2.0)
+        d_calc = min(depth, self._diameter)
+        alpha = 2.0 * math.acos(1.0 - d_calc / self._radius)
+        return self.count * self._diameter * math.sin(alpha / 2.0)
+
+    def hyd_radius(self, depth):
+        d_calc = min(depth, self._diameter)
+        alpha = 2.0 * math.acos(1.0 - d_calc / self._radius)
+        if alpha > 0.0:                             # The count of barrels cancels out
+            return self._k_area * (alpha - math.sin(alpha)) / (alpha * self._radius)
+        return 0.0
 
     def projection(self, depth):
         if depth < self.rise / 2.0:
@@ -106,13 +244,47 @@ class Circle(Section):
             return self.surface_width(d_calc)
         return self.diameter
 
+    def _alphas(self, depths, dtype=float):
+        d_calc = np.minimum(np.asarray(depths, dtype=dtype), self._diameter)
+        return 2.0 * np.arccos(1.0 - d_calc / self._radius)
+
+    def flow_areas(self, depths, dtype=float):
+        alpha = self._alphas(depths, dtype)
+        return self.count * self._k_area * (alpha - np.sin(alpha))
+
+    def wet_perimeters(self, depths, dtype=float):
+        alpha = self._alphas(depths, dtype)
+        return self.count * alpha * self._radius
+
+    def surface_widths(self, depths, dtype=float):
+        alpha = self._alphas(depths, dtype)
+        return self.count * self.diameter * np.sin(alpha / 2.0)
+
+    def hyd_radii(self, depths, dtype=float):
+        alpha = self._alphas(depths, dtype)                         # Share alpha with the areas
+        r_h = np.zeros_like(alpha)
+        np.divide(self._k_area * (alpha - np.sin(alpha)), alpha * self._radius, out=r_h,
+                  where=alpha > 0.0)
+        return r_h
+
 
 class Rectangle(Section):
 
+    __slots__ = ('_span', '_rise', '_perimeter')
+
     def __init__(self, span, rise, count=1, **kwargs):
         super(Rectangle, self).__init__(count, **kwargs)
-        self.span = span
-        self._rise = rise
+        self._span = span
+        self.rise = rise
+
+    @property
+    def span(self):
+        return self._span
+
+    @span.setter
+    def span(self, value):
+        self._span = value
+        self._perimeter = 2.0*value + 2.0*self._rise
 
     @property
     def rise(self):
@@ -121,19 +293,24 @@ class Rectangle(Section):
     @rise.setter
     def rise(self, value):
         self._rise = value
+        self._perimeter = 2.0*self._span + 2.0*value
+
+    @property
+    def kernel_shape(self):
+        return kernels.RECTANGLE, self.span, self.rise, 0.0, 1.0
 
     @property
     def perimeter(self):
-        return 2.0*self.span + 2.0*self.rise
+        return self._perimeter
 
     def flow_area(self, depth):
         d_calc = min(depth, self.rise)
         return d_calc * self.span
 
     def wet_perimeter(self, depth):
-        if depth < self.rise:
-            return self.span + 2.0*depth
-        return self.perimeter
+        if depth < self._rise:
+            return self._span + 2.0*depth
+        return self._perimeter                      # Full, so the top is wet too
 
     def surface_width(self, depth):
         return self.span
@@ -141,9 +318,21 @@ class Rectangle(Section):
     def projection(self, depth):
         return self.span
 
+    def flow_areas(self, depths, dtype=float):
+        return np.minimum(np.asarray(depths, dtype=dtype), self.rise) * self.span
+
+    def wet_perimeters(self, depths, dtype=float):
+        depths = np.asarray(depths, dtype=dtype)
+        return np.where(depths < self.rise, self.span + 2.0*depths, self.perimeter)
+
+    def surface_widths(self, depths, dtype=float):
+        return np.full(np.shape(depths), self.span, dtype=dtype)
+
 
 class Square(Rectangle):
 
+    __slots__ = ('side',)
+
     def __init__(self, side, count=1, **kwargs):
         super(Square, self).__init__(side, side, count, **kwargs)
         self.side = side
@@ -154,18 +343,44 @@ class Square(Rectangle):
 
     @rise.setter
     def rise(self, value):
-        self._rise = value
+        Rectangle.rise.fset(self, value)
         self.side = value
 
 
 class Trapezoid(Section):
 
+    __slots__ = ('_l_slope', '_l_hyp', 'b_width', '_r_slope', '_r_hyp')
+
     def __init__(self, l_slope, b_width, r_slope, count=1, **kwargs):
         super(Trapezoid, self).__init__(count, **kwargs)
         self.l_slope = l_slope
         self.b_width = b_width
         self.r_slope = r_slope
 
+    @property
+    def l_slope(self):
+        """float: The left side slope, as rise over run."""
+        return self._l_slope
+
+    @l_slope.setter
+    def l_slope(self, value):
+        self._l_slope = value
+        self._l_hyp = math.hypot(1.0, 1.0/value)               # Side length per foot of depth
+
+    @property
+    def r_slope(self):
+        """float: The right side slope, as rise over run."""
+        return self._r_slope
+
+    @r_slope.setter
+    def r_slope(self, value):
+        self._r_slope = value
+        self._r_hyp = math.hypot(1.0, 1.0/value)
+
+    @property
+    def kernel_shape(self):
+        return kernels.TRAPEZOID, self.l_slope, self.b_width, self.r_slope, 1.0
+
     def flow_area(self, depth):
         """Get the cross sectional area of flow, given a depth from the invert.
 
@@ -176,9 +391,10 @@ class Trapezoid(Section):
             float: Area, in :math:`feet^2`.
 
         """
-        l = depth**2.0 / 2.0 / self.l_slope
+        d_sq = depth * depth
+        l = d_sq / 2.0 / self.l_slope
         c = self.b_width * depth
-        r = depth**2.0 / 2.0 / self.r_slope
+        r = d_sq / 2.0 / self.r_slope
         return l + c + r
 
     def wet_perimeter(self, depth):
@@ -191,10 +407,7 @@ class Trapezoid(Section):
             float: Wet perimeter, in :math:`feet`.
 
         """
-        l = math.sqrt(depth**2.0 * (1.0 + (1.0/self.l_slope)**2.0))
-        c = self.b_width
-        r = math.sqrt(depth**2.0 * (1.0 + (1.0/self.r_slope)**2.0))
-        return l + c + r
+        return depth*self._l_hyp + self.b_width + depth*self._r_hyp
 
     def surface_width(self, depth):
         l = depth / self.l_slope
@@ -205,13 +418,52 @@ class Trapezoid(Section):
     def projection(self, depth):
         return self.surface_width(depth)
 
+    def flow_areas(self, depths, dtype=float):
+        depths = np.asarray(depths, dtype=dtype)
+        return self.flow_area(depths)
+
+    def wet_perimeters(self, depths, dtype=float):
+        depths = np.asarray(depths, dtype=dtype)
+        return self.wet_perimeter(depths)
+
+    def surface_widths(self, depths, dtype=float):
+        depths = np.asarray(depths, dtype=dtype)
+        return self.surface_width(depths)
+
 
 class Irregular(Section):
 
+    __slots__ = ('_points', '_xs', '_ys', '_elev_lowest', '_max_depth', '_vertices')
+
     def __init__(self, points, count=1, **kwargs):
         super(Irregular, self).__init__(count, **kwargs)
         self.points = points
 
+    @property
+    def points(self):
+        """List[Tuple[float, float]]: The (station, elevation) points of the ground line, in
+        :math:`feet`.
+
+        Note:
+            The stations and elevations are also kept as arrays for the compiled kernels, so
+            assign a new list of points rather than modifying the points in place.
+
+        """
+        return self._points
+
+    @points.setter
+    def points(self, value):
+        self._points = value
+        self._xs = np.array([pt[0] for pt in value], dtype=float)
+        self._ys = np.array([pt[1] for pt in value], dtype=float)
+        self._elev_lowest = min((pt[1] for pt in value), default=None)
+        self._max_depth = max(pt[1] for pt in value) - self._elev_lowest if value else None
+        self._vertices = None, None
+
+    @property
+    def key(self):
+        return type(self).__name__, tuple(tuple(pt) for pt in self.points), self.count, self.n
+
     def flow_vertices(self, depth):
         """Get the new vertices of the cross section including the intersection of ground line with
             the water surface, given a depth from the lowest point.
@@ -223,51 +475,69 @@ class Irregular(Section):
             List[Tuple[float, float]]: The updated vertices (points).
 
         """
-        left = 0                                    # Water surface intersection at left
-        right = 0                                   # Water surface intersection at right
+        if self._vertices[0] == depth:              # flow_area, then wet_perimeter at a depth
+            return self._vertices[1]
         points = []
         elev_water = self.elev_lowest + depth
 
-        for i, pt in enumerate(self.points):
+        x1, y1 = self.points[-1]                    # The first point is joined to the last
+        for pt in self.points:
             x2, y2 = pt
-            pt_prev = self.points[i - 1]
-            x1, y1 = pt_prev
-
-            if left == 0 and y2 < elev_water:
-                left += 1
+            if not points and y2 < elev_water:      # Water surface intersection at left
                 x3 = (elev_water-y1) * (x2-x1) / (y2-y1) + x1
                 points.append((x3, elev_water))
 
-            if left == 1 and right == 0:
-                if y2 > elev_water:
-                    right += 1
+            if points:
+                if y2 > elev_water:                 # Water surface intersection at right
                     x3 = (elev_water-y1) * (x2-x1) / (y2-y1) + x1
                     points.append((x3, elev_water))
-                else:
-                    points.append(pt)
+                    break
+                points.append(pt)
+            x1, y1 = x2, y2
+        self._vertices = depth, points
         return points
 
-    def flow_area(self, depth):
-        """Get the cross sectional area of flow, given a depth from the lowest point.
+    def _geometry(self, depth):
+        """Get the flow area, wet perimeter and surface width together, walking the flow vertices
+            once.
 
         Args:
             depth (float): Depth, in :math:`feet`.
 
         Returns:
-            float: Wet area, in :math:`feet^2`.
+            Tuple[float, float, float]: Area, in :math:`feet^2`, wet perimeter and surface width,
+                in :math:`feet`, or nan above :attr:`max_depth`.
 
         """
-
+        if depth > self.max_depth:                          # Out of the section
+            return math.nan, math.nan, math.nan
+        if kernels.ENABLED:
+            return kernels.irregular_geometry(self._xs, self._ys, self.elev_lowest + depth)
         vertices = self.flow_vertices(depth)
+        if not vertices:
+            return 0.0, 0.0, 0.0
+        n = len(vertices)
         area = 0.0
-        for i, v in enumerate(vertices):
-            n = len(vertices)
-            j = (i + 1) % n
-            x1, y1 = v
-            x2, y2 = vertices[j]
+        perimeter = 0.0
+        for i, (x1, y1) in enumerate(vertices):
+            x2, y2 = vertices[(i + 1) % n]
             area += x1 * y2
             area -= x2 * y1
-        return abs(area) / 2.0
+            if i + 1 < n:                           # The water surface is not wet
+                perimeter += math.hypot(x2 - x1, y2 - y1)
+        return abs(area) / 2.0, perimeter, abs(vertices[-1][0] - vertices[0][0])
+
+    def flow_area(self, depth):
+        """Get the cross sectional area of flow, given a depth from the lowest point.
+
+        Args:
+            depth (float): Depth, in :math:`feet`.
+
+        Returns:
+            float: Wet area, in :math:`feet^2`.
+
+        """
+        return self._geometry(depth)[0]
 
     def wet_perimeter(self, depth):
         """Get the wet perimeter of flow, given a depth from the lowest point.
@@ -279,13 +549,57 @@ class Irregular(Section):
             float: Wet perimeter, in :math:`feet`.
 
         """
-        perimeter = 0.0
-        vertices = self.flow_vertices(depth)
-        for pt1, pt2 in zip(vertices, vertices[1:]):
-            x1, y1 = pt1
-            x2, y2 = pt2
-            perimeter += math.hypot(x2 - x1, y2 - y1)
-        return perimeter
+        return self._geometry(depth)[1]
+
+    def surface_width(self, depth):
+        """Get the width of the water surface between its intersections with the ground line.
+
+        Args:
+            depth (float): Depth, in :math:`feet`.
+
+        Returns:
+            float: Surface width, in :math:`feet`.
+
+        """
+        return self._geometry(depth)[2]
+
+    def hyd_radius(self, depth):
+        a_f, p_w, _ = self._geometry(depth)
+        if p_w > 0.0 or math.isnan(p_w):
+            return a_f / p_w
+        return 0.0
+
+    def _geometries(self, depths):
+        depths = np.ravel(np.asarray(depths, dtype=float))
+        geometries = kernels.irregular_geometries(self._xs, self._ys, self.elev_lowest + depths)
+        above = depths > self.max_depth                     # Out of the section
+        if above.any():
+            for values in geometries:
+                values[above] = np.nan
+        return geometries
+
+    def hyd_radii(self, depths, dtype=float):
+        if kernels.ENABLED:
+            a_f, p_w, _ = self._geometries(depths)
+            r_h = np.zeros_like(p_w)
+            np.divide(a_f, p_w, out=r_h, where=~(p_w <= 0.0))  # nan stays nan
+            return r_h.astype(dtype, copy=False)
+        return super(Irregular, self).hyd_radii(depths, dtype)
+
+    def flow_areas(self, depths, dtype=float):
+        if kernels.ENABLED:
+            return self._geometries(depths)[0].astype(dtype, copy=False)
+        return super(Irregular, self).flow_areas(depths, dtype)
+
+    def wet_perimeters(self, depths, dtype=float):
+        if kernels.ENABLED:
+            return self._geometries(depths)[1].astype(dtype, copy=False)
+        return super(Irregular, self).wet_perimeters(depths, dtype)
+
+    def surface_widths(self, depths, dtype=float):
+        if kernels.ENABLED:
+            return self._geometries(depths)[2].astype(dtype, copy=False)
+        return super(Irregular, self).surface_widths(depths, dtype)
 
     @property
     def elev_lowest(self):
@@ -295,4 +609,10 @@ class Irregular(Section):
             float: Elevation, in :math:`feet`.
 
         """
-        return min(pt[1] for pt in self.points)
+        return self._elev_lowest
+
+    @property
+    def max_depth(self):
+        """float: The depth from the lowest point to the highest point of the ground line, in
+        :math:`feet`. The water surface can't be intersected above it."""
+        return self._max_depth
@@ -45,12 +45,15 @@ def array_from_csv(filename):
         filename (str): The name of the file to open.
 
     Returns:
-        numpy.ndarray: a numpy array representing the data.
+        numpy.ndarray: a numpy array representing the data, with a row for each line.
+
+    Raises:
+        IOError: if the specified filename does not have an associated file.
 
     """
-    data = tuple_list_from_csv(filename)
-    array = np.array(data)
-    return array
+    if os.path.isfile(filename):
+        return np.loadtxt(filename, delimiter=',', dtype=float, ndmin=2)
+    raise IOError
 
 
 def csv_from_tuple_list(filename, data):
@@ -32,3 +32,41 @@ class BuildTest(unittest.TestCase):
         produced = build.links_down_to_node(o1_1, reaches)
         expected = [p101, p102]
         self.assertEqual(produced, expected)
+
+    def test_links_branched_network(self):
+        network = nw.Network()
+        s6 = network.create_node()
+        s8 = network.create_node()
+        s4 = network.create_node()
+        s7 = network.create_node()
+        s5 = network.create_node()
+        out = network.create_node()
+        rc18 = sections.Circle(diameter=1.5, mannings=0.012)
+        p6 = s6.create_reach(node_2=s8, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        p8 = s8.create_reach(node_2=out, inverts=(7.0, 6.0), length=300.0, section=rc18)
+        p4 = s4.create_reach(node_2=s7, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        p7 = s7.create_reach(node_2=s8, inverts=(8.0, 7.0), length=300.0, section=rc18)
+        p5 = s5.create_reach(node_2=s7, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        self.assertEqual(build.links_up_from_node(out, network.links), [p8, p6, p7, p4, p5])
+        self.assertEqual(build.links_down_to_node(out, network.links), [p5, p4, p7, p6, p8])
+        self.assertEqual(build.links_down_from_node(s4, network.links), [p4, p7, p8])
+        self.assertEqual(build.links_up_to_node(s4, network.links), [p8, p7, p4])
+
+    def test_links_up_from_node_order(self):
+        network = nw.Network()
+        s6 = network.create_node()
+        s8 = network.create_node()
+        s4 = network.create_node()
+        s7 = network.create_node()
+        s5 = network.create_node()
+        s9 = network.create_node()
+        out = network.create_node()
+        rc18 = sections.Circle(diameter=1.5, mannings=0.012)
+        p6 = s6.create_reach(node_2=s8, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        p8 = s8.create_reach(node_2=out, inverts=(7.0, 6.0), length=300.0, section=rc18)
+        p4 = s4.create_reach(node_2=s7, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        p7 = s7.create_reach(node_2=s8, inverts=(8.0, 7.0), length=300.0, section=rc18)
+        p5 = s5.create_reach(node_2=s7, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        p9 = s9.create_reach(node_2=s6, inverts=(10.0, 9.0), length=300.0, section=rc18)
+        produced = build.links_up_from_node(out, network.links)
+        self.assertEqual(produced, [p8, p6, p7, p4, p5, p9])
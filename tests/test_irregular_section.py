@@ -1,7 +1,10 @@
 
 
 import unittest
-from pyflo import sections
+
+import numpy as np
+
+from pyflo import kernels, sections
 
 
 class IrregularSectionTest(unittest.TestCase):
@@ -40,6 +43,115 @@ class IrregularSectionTest(unittest.TestCase):
         expected = 496
         self.assertAlmostEqual(produced, expected, 1)
 
+    def test_elev_lowest_follows_points(self):
+        s = sections.Irregular([(0.0, 12.0), (5.0, 10.5), (10.0, 12.0)])
+        self.assertEqual(s.elev_lowest, 10.5)
+        self.assertAlmostEqual(s.flow_area(1.5), 7.5, 9)
+        self.assertListEqual(s.flow_vertices(1.5), [(0.0, 12.0), (5.0, 10.5), (10.0, 12.0)])
+        s.points = [(0.0, 12.0), (5.0, 9.0), (10.0, 12.0)]
+        self.assertEqual(s.elev_lowest, 9.0)
+        self.assertListEqual(s.flow_vertices(1.5), [(2.5, 10.5), (5.0, 9.0), (7.5, 10.5)])
+
+    def test_surface_width(self):
+        s = sections.Irregular([(0.0, 2.0), (2.0, 0.0), (6.0, 0.0), (8.0, 2.0)])
+        self.assertAlmostEqual(s.surface_width(0.0), 0.0, 9)
+        self.assertAlmostEqual(s.surface_width(1.0), 6.0, 9)
+        self.assertAlmostEqual(s.surface_width(2.0), 8.0, 9)
+
+    def test_kernel_matches_python(self):
+        points = [(0.0, 0.0), (5.0, -2.1), (10.0, -3.4), (15.0, -1.6), (20.0, -4.7), (25.0, 0.5)]
+        s = sections.Irregular(points)
+        enabled = kernels.ENABLED
+        try:
+            results = []
+            for kernels.ENABLED in (True, False):
+                results.append([
+                    (s.flow_area(d), s.wet_perimeter(d), s.hyd_radius(d), s.surface_width(d))
+                    for d in (0.0, 1.0, 3.1, 4.7, 5.0)
+                ])
+            for k, p in zip(*results):
+                for a, b in zip(k, p):
+                    self.assertAlmostEqual(a, b, 9)
+        finally:
+            kernels.ENABLED = enabled
+
+    def test_kernel_matches_python_edge_cases(self):
+        shapes = [
+            [(0.0, -1.0), (4.0, -3.0), (8.0, 2.0), (12.0, 1.0)],                # First point wet
+            [(0.0, 3.0), (2.0, 1.0), (4.0, 1.0), (6.0, 2.0), (8.0, 0.0), (9.0, 3.0)],  # Two pools
+            [(0, 4), (3, 0), (6, 2), (9, 2), (12, 4)],                            # Integer points
+        ]
+        enabled = kernels.ENABLED
+        try:
+            for points in shapes:
+                s = sections.Irregular(points)
+                results = []
+                for kernels.ENABLED in (True, False):
+                    results.append([
+                        (s.flow_area(d), s.wet_perimeter(d), s.hyd_radius(d), s.surface_width(d))
+                        for d in (0.5, 1.0, 1.5, 2.0, 2.5, 3.0)
+                    ])
+                for k, p in zip(*results):
+                    for a, b in zip(k, p):
+                        self.assertAlmostEqual(a, b, 9)
+        finally:
+            kernels.ENABLED = enabled
+
+    def test_batch_matches_scalar(self):
+        points = [(0.0, 0.0), (5.0, -2.1), (10.0, -3.4), (15.0, -1.6), (20.0, -4.7), (25.0, 0.5)]
+        s = sections.Irregular(points)
+        depths = np.linspace(0.0, 5.0, 11)
+        enabled = kernels.ENABLED
+        try:
+            for kernels.ENABLED in (True, False):
+                for method in ('flow_area', 'wet_perimeter', 'hyd_radius', 'surface_width'):
+                    batch = {'hyd_radius': 'hyd_radii'}.get(method, method + 's')
+                    expected = [getattr(s, method)(d) for d in depths]
+                    produced = getattr(s, batch)(depths)
+                    np.testing.assert_allclose(produced, expected, rtol=1e-12)
+        finally:
+            kernels.ENABLED = enabled
+
+    def test_batch_above_banks(self):
+        s = sections.Irregular([(0.0, 12.0), (5.0, 10.5), (10.0, 12.0)])
+        self.assertEqual(s.max_depth, 1.5)
+        elevs = np.array([11.0, 12.0, 12.5, 20.0])
+        areas, perimeters, widths = kernels.irregular_geometries(s._xs, s._ys, elevs)
+        self.assertTrue(np.isnan(areas[2:]).all())
+        self.assertTrue(np.isnan(perimeters[2:]).all())
+        self.assertTrue(np.isnan(widths[2:]).all())
+        depths = np.array([0.5, 1.5, 2.0, 2.0**20])
+        enabled = kernels.ENABLED
+        try:
+            kernels.ENABLED = True
+            for batch in ('flow_areas', 'wet_perimeters', 'hyd_radii', 'surface_widths'):
+                produced = getattr(s, batch)(depths)
+                self.assertTrue(np.isfinite(produced[:2]).all())
+                self.assertTrue(np.isnan(produced[2:]).all())
+            s.points = [(0.0, 2.0), (2.0, 0.0), (6.0, 0.0), (8.0, 3.0)]    # Unequal banks
+            self.assertListEqual(np.isnan(s.flow_areas([2.5, 3.0, 4.0])).tolist(),
+                                 [False, False, True])
+        finally:
+            kernels.ENABLED = enabled
+
+    def test_scalar_above_banks(self):
+        s = sections.Irregular([(0.0, 12.0), (5.0, 10.5), (10.0, 12.0)])
+        depths = np.array([0.5, 1.5, 2.0, 2.0**20])
+        enabled = kernels.ENABLED
+        try:
+            results = []
+            for kernels.ENABLED in (True, False):
+                self.assertTrue(np.isnan(s.flow_area(2.0)))
+                self.assertTrue(np.isnan(s.hyd_radius(2.0)))
+                results.append([
+                    getattr(s, batch)(depths).tolist()
+                    for batch in ('flow_areas', 'wet_perimeters', 'hyd_radii', 'surface_widths')
+                ])
+            for k, p in zip(*results):
+                np.testing.assert_allclose(k, p, rtol=1e-12)
+        finally:
+            kernels.ENABLED = enabled
+
     # def test_problem_2(self):
     #     # Calculate the cross sectional area given
     #     points = [
@@ -1,7 +1,7 @@
 
 import unittest
 
-from pyflo import sections, networks, links
+from pyflo import build, sections, networks, links
 from pyflo.rational import hydraulics, hydrology
 
 
@@ -33,6 +33,20 @@ class NetworkTest(unittest.TestCase):
         # self.assertEqual(produced, expected)
         self.assertTupleEqual(produced, expected)
 
+    def test_cumulative_runoff_follows_basin_edits(self):
+        network = networks.Network()
+        s101 = network.create_node()
+        o1_1 = network.create_node()
+        rc18 = sections.Circle(diameter=1.5, mannings=0.012)
+        r1 = s101.create_reach(node_2=o1_1, inverts=(8.0, 7.0), length=300.0, section=rc18)
+        b101 = hydrology.Basin(tc=10.0, area=0.1, c=0.95)
+        s101.add_basin(b101)
+        hydraulics.totaled_basin_data(o1_1)
+        b101.add_shapes([(0.3, 0.5)])
+        basin_data = hydraulics.totaled_basin_data(o1_1)
+        self.assertAlmostEqual(basin_data[r1]['area'], 0.4)
+        self.assertAlmostEqual(basin_data[r1]['c'], (0.1*0.95 + 0.3*0.5) / 0.4)
+
     def test_same_node_reach_from_func(self):
         network = networks.Network()
         s101 = network.create_node()
@@ -46,3 +60,49 @@ class NetworkTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             rc18 = sections.Circle(diameter=1.5, mannings=0.012)
             links.Reach(node_1=s101, node_2=s101, inverts=(8.0, 7.0), length=300.0, section=rc18)
+
+    def test_gathered_components_follow_additions(self):
+        network = networks.Network()
+        s101 = network.create_node()
+        s102 = network.create_node()
+        self.assertListEqual(network.links, [])
+        rc18 = sections.Circle(diameter=1.5, mannings=0.012)
+        r1 = s101.create_reach(node_2=s102, inverts=(8.0, 7.0), length=300.0, section=rc18)
+        self.assertListEqual(network.links, [r1])
+        self.assertListEqual(network.reaches, [r1])
+        self.assertIn(r1, network.link_set)
+        b101 = hydrology.Basin(tc=10.0, area=0.1, c=0.95)
+        links_gathered = network.links
+        s101.add_basin(b101)
+        self.assertListEqual(network.basins, [b101])
+        self.assertIs(network.links, links_gathered)
+        o1_1 = network.create_node()
+        r2 = s102.create_reach(node_2=o1_1, inverts=(7.0, 6.0), length=300.0, section=rc18)
+        self.assertListEqual(network.links, [r1, r2])
+
+    def test_traced_links_follow_additions(self):
+        network = networks.Network()
+        s101 = network.create_node()
+        s102 = network.create_node()
+        rc18 = sections.Circle(diameter=1.5, mannings=0.012)
+        r1 = s101.create_reach(node_2=s102, inverts=(8.0, 7.0), length=300.0, section=rc18)
+        traced = network.traced_links(build.links_down_to_node, s102)
+        self.assertListEqual(traced, [r1])
+        self.assertIs(network.traced_links(build.links_down_to_node, s102), traced)
+        self.assertListEqual(network.traced_links(build.links_up_from_node, s102), [r1])
+        s100 = network.create_node()
+        r0 = s100.create_reach(node_2=s101, inverts=(9.0, 8.0), length=300.0, section=rc18)
+        self.assertListEqual(network.traced_links(build.links_down_to_node, s102), [r0, r1])
+
+    def test_shared_section(self):
+        network = networks.Network()
+        rc18 = network.shared_section(sections.Circle(diameter=1.5, n=0.012))
+        self.assertIs(network.shared_section(sections.Circle(diameter=1.5, n=0.012)), rc18)
+        rc24 = network.shared_section(sections.Circle(diameter=2.0, n=0.012))
+        self.assertIsNot(rc24, rc18)
+        rc18_rough = network.shared_section(sections.Circle(diameter=1.5, n=0.024))
+        self.assertIsNot(rc18_rough, rc18)
+        rec = network.shared_section(sections.Rectangle(span=2.0, rise=3.0, n=0.012))
+        rec_3 = network.shared_section(sections.Rectangle(span=2.0, rise=3.0, count=3, n=0.012))
+        self.assertIsNot(rec_3, rec)
+        self.assertEqual(rec_3.count, 3)
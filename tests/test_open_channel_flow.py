@@ -1,7 +1,10 @@
 
 import unittest
 
-from pyflo import links, sections
+import numpy as np
+from scipy import optimize
+
+from pyflo import kernels, links, sections
 
 
 class RectangularChannelsTest(unittest.TestCase):
@@ -20,6 +23,25 @@ class RectangularChannelsTest(unittest.TestCase):
         expected = 0.314  # ft
         self.assertAlmostEqual(produced, expected, 3)
 
+    def test_flow_balances_energy(self):
+        s = sections.Rectangle(span=2.0, rise=3.0, n=0.013)
+        reach = links.Reach(section=s, inverts=(10.0, 9.9), length=5.0)
+        for stage_2 in (10.2, 11.0, 12.0):
+            flow = reach.flow(10.05, stage_2)
+            self.assertAlmostEqual(reach.flow_accuracy(flow, 10.05, stage_2), 0.0, 9)
+
+    def test_wet_perimeter_of_full_box(self):
+        s = sections.Rectangle(span=2.0, rise=1.2)
+        self.assertAlmostEqual(s.wet_perimeter(1.0), 4.0, 9)
+        self.assertAlmostEqual(s.wet_perimeter(1.5), 6.4, 9)   # The top is wet once full
+        s.rise = 2.0
+        self.assertAlmostEqual(s.wet_perimeter(1.5), 5.0, 9)
+        s.span = 3.0
+        self.assertAlmostEqual(s.wet_perimeter(2.5), 10.0, 9)
+        s = sections.Square(side=2.0)
+        s.rise = 1.0
+        self.assertAlmostEqual(s.wet_perimeter(1.5), 6.0, 9)
+
 
 class CircularChannelTest(unittest.TestCase):
     """From Practice Problems for the Civil Engineering PE Exam by Michael R. Lindeburg, PE:
@@ -45,6 +67,23 @@ class CircularChannelTest(unittest.TestCase):
         expected = 2.3  # ft/s
         self.assertAlmostEqual(produced, expected, 1)
 
+    def test_normal_depth_resolved_after_slope_change(self):
+        depth_1 = self.pipe.normal_depth(3.0)
+        self.assertEqual(self.pipe.normal_depth(3.0), depth_1)
+        self.pipe.slope = 0.01
+        depth_2 = self.pipe.normal_depth(3.0)
+        self.assertLess(depth_2, depth_1)
+
+    def test_normal_depth_memo_drops_least_recent(self):
+        memo_size = links._MEMO_SIZE
+        try:
+            links._MEMO_SIZE = 2
+            for flow in (1.0, 2.0, 1.0, 3.0):
+                self.pipe.normal_depth(flow)
+            self.assertListEqual(list(self.pipe._normal_depths), [1.0, 3.0])
+        finally:
+            links._MEMO_SIZE = memo_size
+
 
 class TrapezoidalChannelTest(unittest.TestCase):
     """From Practice Problems for the Civil Engineering PE Exam by Michael R. Lindeburg, PE:
@@ -114,3 +153,147 @@ class FDOTChannelTest(unittest.TestCase):
         produced = self.channel.normal_flow(self.depth)
         expected = 4.8  # cfs
         self.assertAlmostEqual(produced, expected, 1)
+
+
+class IrregularChannelTest(unittest.TestCase):
+
+    def test_normal_depth_with_equal_banks(self):
+        # Trial depths above the banks are out of the section
+        shapes = [
+            ([(0.0, 12.0), (5.0, 10.5), (10.0, 12.0)], (0.3688, 0.7222)),
+            ([(0.0, 2.0), (2.0, 0.0), (6.0, 0.0), (8.0, 2.0)], (0.1358, 0.3984)),
+        ]
+        enabled = kernels.ENABLED
+        try:
+            for kernels.ENABLED in (True, False):
+                for points, expected in shapes:
+                    s = sections.Irregular(points, n=0.03)
+                    reach = links.Reach(section=s, inverts=(10.0, 9.0), length=200.0)
+                    for flow, e in zip((0.5, 3.0), expected):
+                        self.assertAlmostEqual(reach.normal_depth(flow), e, 4)
+                    reach.clear_solutions()
+                    produced = reach.normal_depths([0.5, 3.0]).tolist()
+                    for e, p in zip(expected, produced):
+                        self.assertAlmostEqual(e, p, 4)
+                    self.assertLess(reach.critical_depth(3.0), s.max_depth)
+        finally:
+            kernels.ENABLED = enabled
+
+class BatchDepthTest(unittest.TestCase):
+
+    def setUp(self):
+        self.depths = np.array([0.0, 0.3, 1.0, 1.5, 2.5])
+        self.sections = [
+            sections.Circle(diameter=1.5, n=0.012),
+            sections.Rectangle(span=2.0, rise=1.2, n=0.012),
+            sections.Trapezoid(l_slope=1/3, b_width=6.0, r_slope=1/4, n=0.013),
+        ]
+
+    def test_section_arrays(self):
+        for s in self.sections:
+            for method in ('flow_area', 'wet_perimeter', 'hyd_radius', 'surface_width'):
+                batch = {'hyd_radius': 'hyd_radii'}.get(method, method + 's')
+                expected = [getattr(s, method)(d) for d in self.depths]
+                produced = getattr(s, batch)(self.depths).tolist()
+                for e, p in zip(expected, produced):
+                    self.assertAlmostEqual(e, p, 9)
+
+    def test_single_precision_arrays(self):
+        for s in self.sections:
+            for method in ('flow_areas', 'wet_perimeters', 'hyd_radii'):
+                expected = getattr(s, method)(self.depths)
+                produced = getattr(s, method)(self.depths, np.float32)
+                self.assertEqual(produced.dtype, np.float32)
+                np.testing.assert_allclose(produced, expected, rtol=1e-5, atol=1e-6)
+
+    def test_normal_depths(self):
+        flows = [0.5, 2.0, 8.0]
+        for s in self.sections:
+            reach = links.Reach(section=s, slope=0.002)
+            produced = reach.normal_depths(flows).tolist()
+            self.assertListEqual(reach.normal_depths(flows).tolist(), produced)  # memoized
+            reach.clear_solutions()
+            expected = [reach.normal_depth(flow) for flow in flows]
+            for e, p in zip(expected, produced):
+                self.assertAlmostEqual(e, p, 9)
+
+    @unittest.skipIf(kernels.numba is None, 'numba is not installed')
+    def test_kernels_match_python(self):
+        enabled = kernels.ENABLED
+        try:
+            for s in self.sections:
+                reach = links.Reach(section=s, inverts=(10.0, 9.0), length=200.0, k_minor=0.5)
+                results = []
+                for kernels.ENABLED in (True, False):
+                    reach.clear_solutions()
+                    results.append([
+                        reach.normal_depth(2.0), reach.critical_depth(2.0), reach.stage_1(9.6, 2.0)
+                    ])
+                for k, p in zip(*results):
+                    self.assertAlmostEqual(k, p, 9)
+        finally:
+            kernels.ENABLED = enabled
+
+    @unittest.skipIf(kernels.numba is None, 'numba is not installed')
+    def test_weir_kernel_matches_python(self):
+        enabled = kernels.ENABLED
+        try:
+            weir = links.Weir(invert=10.0, k_orif=0.6, k_weir=3.0, section=self.sections[2])
+            results = []
+            for kernels.ENABLED in (True, False):
+                results.append([weir.normal_depth(flow) for flow in (0.5, 2.0, 8.0)])
+            for k, p in zip(*results):
+                self.assertAlmostEqual(k, p, 9)
+        finally:
+            kernels.ENABLED = enabled
+
+    def test_grid_bracket(self):
+        enabled = kernels.ENABLED
+        try:
+            kernels.ENABLED = False
+            reach = links.Reach(section=self.sections[0], slope=0.002)
+            for flow in (0.01, 0.5, 2.0):
+                expected = optimize.brentq(reach.normal_depth_accuracy, 1e-12, 1.5, args=(flow,))
+                self.assertAlmostEqual(expected, reach.normal_depth(flow), 9)
+                expected = optimize.brentq(reach.critical_depth_accuracy, 1e-12, 1.5, args=(flow,))
+                self.assertAlmostEqual(expected, reach.critical_depth(flow), 9)
+        finally:
+            kernels.ENABLED = enabled
+
+
+class BisectBitsTest(unittest.TestCase):
+
+    def test_adjacent_floats(self):
+        produced = links._bisect_bits(lambda x: x*x - 2.0, 1.0, 2.0)
+        self.assertEqual(produced, 2.0**0.5)
+
+    def test_wide_bracket(self):
+        calls = []
+
+        def accuracy(x):
+            calls.append(x)
+            return x - 0.123
+
+        self.assertEqual(links._bisect_bits(accuracy, 1e-12, 1e30), 0.123)
+        self.assertLessEqual(len(calls), 66)
+
+    def test_no_sign_change(self):
+        self.assertRaises(ValueError, links._bisect_bits, lambda x: x + 1.0, 1.0, 2.0)
+
+
+class ChandrupatlaTest(unittest.TestCase):
+
+    def test_roots(self):
+        targets = np.array([2.0, 3.0, 0.0, 1e6])
+
+        def accuracy(x, index):
+            return x*x*x - targets[index]
+
+        produced = links._chandrupatla(accuracy, np.zeros(4), np.full(4, 200.0))
+        for e, p in zip(np.cbrt(targets), produced):
+            self.assertAlmostEqual(e, p, 9)
+
+    def test_no_sign_change(self):
+        self.assertRaises(
+            ValueError, links._chandrupatla, lambda x, index: x + 1.0, [1.0, -2.0], [2.0, 2.0]
+        )
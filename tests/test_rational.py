@@ -30,6 +30,27 @@ class ImportIntensityFromJsonTest(unittest.TestCase):
         self.assertEqual(produced, expected)
 
 
+class EvaluatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = distributions.Evaluator(
+            equation='[a] / ([b] + [t])', x_key='[t]', eq_kwargs={'[a]': 120.0, '[b]': 15.0}
+        )
+
+    def test_get_y(self):
+        self.assertEqual(self.evaluator.get_y(5.0), 120.0 / (15.0 + 5.0))
+
+    def test_get_y_after_edits(self):
+        self.evaluator.get_y(5.0)
+        self.evaluator.eq_kwargs['[a]'] = 60.0
+        self.assertEqual(self.evaluator.get_y(5.0), 60.0 / (15.0 + 5.0))
+        self.evaluator.equation = '[a] * [t]'
+        self.assertEqual(self.evaluator.get_y(5.0), 300.0)
+
+    def test_invalid_equation(self):
+        self.assertRaises(ValueError, self.evaluator.get_y, -15.0)
+
+
 class OneReachGeopakTest(unittest.TestCase):
 
     def setUp(self):
@@ -140,6 +161,11 @@ class FiveReachGeopakTest(unittest.TestCase):
         expected = (21.5, 20.8, 21.2, 6.3, 6.1)
         self.assertTupleEqual(produced, expected)
 
+    def test_result_array(self):
+        produced = hydraulics.result_array(self.data)
+        self.assertListEqual(produced['flow'].tolist(), [d['flow'] for d in self.data.values()])
+        self.assertListEqual(produced['hgl_1'].tolist(), [d['hgl_1'] for d in self.data.values()])
+
 
 class FlatAnalysisTest(unittest.TestCase):
 
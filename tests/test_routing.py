@@ -2,6 +2,7 @@
 import unittest
 
 import numpy
+from scipy import optimize
 
 from pyflo import networks, system, sections, routing
 from pyflo.nrcs import hydrology
@@ -38,6 +39,25 @@ class ReservoirTest(unittest.TestCase):
         produced = self.reservoir.stage(storage)
         self.assertAlmostEqual(produced, expected)
 
+    def test_solve_stage_at_contours(self):
+        for expected in (1.5, 14.0, 26.0, 30.5):
+            storage = self.reservoir.storage(expected)
+            self.assertAlmostEqual(self.reservoir.stage(storage), expected, 12)
+        storage = self.reservoir.storage(30.5)
+        self.assertRaises(ValueError, self.reservoir.stage, storage * 1.01)
+
+
+class BisectTest(unittest.TestCase):
+
+    def test_matches_scipy(self):
+        for target in (2.0, 7.5, 20.0):
+            expected = optimize.bisect(lambda x, t: x*x - t, 0.0, 5.0, args=(target,))
+            produced = routing._bisect(lambda x, t: x*x - t, 0.0, 5.0, (target,))
+            self.assertEqual(produced, expected)
+
+    def test_no_sign_change(self):
+        self.assertRaises(ValueError, routing._bisect, lambda x: x + 1.0, 1.0, 2.0)
+
 
 class BleedDownTest(unittest.TestCase):
 
@@ -69,6 +89,12 @@ class BleedDownTest(unittest.TestCase):
         expected = self.reservoir.storage(29.8)
         self.assertGreater(produced, expected)
 
+    def test_area(self):
+        self.assertEqual(self.reservoir.area(21.5), 0.42 * 43560.0)
+        self.assertAlmostEqual(self.reservoir.area(22.5), 0.515 * 43560.0)
+        self.assertAlmostEqual(self.reservoir.area(30.8), (1.25 + 0.64 / 6.3) * 43560.0)
+        self.assertTrue(numpy.isnan(self.reservoir.area(15.0)))
+
     def test_node_solution_results(self):
         results = self.analysis.node_solution_results()
         data = results[self.weir]['data']
@@ -76,6 +102,57 @@ class BleedDownTest(unittest.TestCase):
         expected = 25.28
         self.assertAlmostEqual(produced, expected, 2)
 
+    def test_compiled_routing_matches_python(self):
+        results = self.analysis.node_solution_results()
+        self.analysis._compiled = lambda results: False
+        expected = self.analysis.node_solution_results()
+        self.assertListEqual(results[self.weir]['data'], expected[self.weir]['data'])
+
+    def test_result_arrays(self):
+        results = self.analysis.node_solution_results()
+        data = results[self.weir]['data']
+        produced = routing.result_arrays(results)[self.weir]
+        self.assertListEqual(produced['stage'].tolist(), [line['stage'] for line in data])
+        self.assertListEqual(produced['time'].tolist(), [line['time'] for line in data])
+
+
+class SeriesTest(unittest.TestCase):
+
+    def setUp(self):
+        network = networks.Network()
+        contours = [
+            (16.0, 0.10 * 43560.0),
+            (21.5, 0.42 * 43560.0),
+            (23.5, 0.61 * 43560.0),
+            (29.8, 1.25 * 43560.0)
+        ]
+        up = network.create_node()
+        up.add_reservoir(reservoir=routing.Reservoir(contours=contours, start_stage=25.35))
+        down = network.create_node()
+        down.add_reservoir(reservoir=routing.Reservoir(contours=contours, start_stage=24.0))
+        out = network.create_node()
+        diameter = 3.25 / 12.0
+        ci1 = sections.Circle(diameter=diameter)
+        ci2 = sections.Circle(diameter=diameter)
+        self.weir_1 = up.create_weir(node_2=down, invert=23.5, k_orif=0.6, k_weir=3.2,
+                                     section=ci1)
+        self.weir_2 = down.create_weir(node_2=out, invert=23.5, k_orif=0.6, k_weir=3.2,
+                                       section=ci2)
+        interval = 5.0 / 60.0
+        self.analysis = routing.Analysis(node=out, tw=0.0, duration=2.0, interval=interval)
+
+    def test_node_solution_results(self):
+        results = self.analysis.node_solution_results()
+        self.assertAlmostEqual(results[self.weir_1]['data'][-1]['stage'], 25.29, 2)
+        self.assertAlmostEqual(results[self.weir_2]['data'][-1]['stage'], 24.04, 2)
+
+    def test_compiled_routing_matches_python(self):
+        results = self.analysis.node_solution_results()
+        self.analysis._compiled = lambda results: False
+        expected = self.analysis.node_solution_results()
+        for weir in (self.weir_1, self.weir_2):
+            self.assertListEqual(results[weir]['data'], expected[weir]['data'])
+
 
 class BasinTest(unittest.TestCase):
 
@@ -156,6 +233,14 @@ class BasinTest(unittest.TestCase):
         ]
         self.assertListEqual(produced, expected)
 
+    def test_unit_hydrograph_cache(self):
+        hydrograph = self.basin.unit_hydrograph(interval=0.3)
+        self.assertIs(self.basin.unit_hydrograph(interval=0.3), hydrograph)
+        self.basin.tc *= 2.0
+        produced = self.basin.unit_hydrograph(interval=0.3)
+        self.assertIsNot(produced, hydrograph)
+        self.assertGreater(hydrograph[:, 1].max(), produced[:, 1].max())
+
     def test_rainfall_hydrograph(self):
         rainfall_dist = numpy.array(self.ratio_pairs)
         rainfall_depths = rainfall_dist * [6.0, 5.0]
@@ -218,6 +303,12 @@ class BasinTest(unittest.TestCase):
         ]
         self.assertListEqual(produced, expected)
 
+    def test_runoff_depths(self):
+        rainfall_depths = numpy.array(self.ratio_pairs)[:, 1] * 5.0
+        produced = self.basin.runoff_depths(rainfall_depths).tolist()
+        expected = [self.basin.runoff_depth(depth) for depth in rainfall_depths.tolist()]
+        self.assertListEqual(produced, expected)
+
     def test_runoff_depth_incremental(self):
         rainfall_dist = numpy.array(self.ratio_pairs)
         rainfall_depths = rainfall_dist * [6.0, 5.0]
@@ -160,3 +160,17 @@ class TupleFromCsvTest(unittest.TestCase):
             (1.000, 1.000)
         ]
         self.assertListEqual(produced, expected)
+
+
+class ArrayFromCsvTest(unittest.TestCase):
+
+    def test_matches_tuple_list(self):
+        for filename in ('./resources/distributions/runoff/scs256.csv',
+                         './resources/distributions/rainfall/nrcsiii.csv'):
+            produced = system.array_from_csv(filename)
+            expected = system.tuple_list_from_csv(filename)
+            self.assertListEqual(list(map(tuple, produced.tolist())), expected)
+
+    def test_missing_file(self):
+        with self.assertRaises(IOError):
+            system.array_from_csv('./resources/missing.csv')
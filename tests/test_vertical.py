@@ -253,3 +253,67 @@ class KeyStationTest(unittest.TestCase):
         produced = self.profile.key_stations(2, 33.3333)
         expected = [0.0, 50.0, 83.33, 100.0, 116.67, 150.0, 200.0]
         self.assertListEqual(produced, expected)
+
+
+class EditPointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = Profile()
+        self.profile.create_pt(000.0, 00.0)
+        self.pt = self.profile.create_pt(100.0, 12.0)
+        self.profile.create_pt(200.0, 10.0)
+
+    def test_edit_elevation(self):
+        self.assertEqual(self.profile.elevation(150.0), 11.0)
+        self.pt.elevation = 20.0
+        self.assertEqual(self.profile.elevation(150.0), 15.0)
+        self.assertListEqual(self.profile.elevations([150.0]).tolist(), [15.0])
+
+    def test_edit_station(self):
+        self.assertEqual(self.profile.elevation(150.0), 11.0)
+        self.pt.station = 300.0
+        self.assertListEqual([pt.station for pt in self.profile.pts], [0.0, 200.0, 300.0])
+        self.assertEqual(self.profile.elevation(150.0), 7.5)
+        self.assertEqual(self.profile.last_station, 300.0)
+
+
+class BatchStationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = Profile()
+        self.profile.create_pt(113600.00, 063.003)
+        self.profile.create_pt(114712.97, 051.873, 0800.0)
+        self.profile.create_pt(117454.76, 099.854, 2360.0)
+        self.profile.create_pt(119104.00, 052.026, 0800.0)
+        self.profile.create_pt(120633.36, 059.673, 0800.0)
+        self.profile.create_pt(122474.50, 114.907, 1700.0)
+        self.profile.create_pt(124750.00, 108.081, 0800.0)
+        self.profile.create_pt(126341.51, 139.911)
+        self.stations = [
+            114065.00, 114412.85, 114980.00, 117595.00, 118940.00, 119225.00, 119386.35,
+            119504.00, 120233.36, 120300.00, 120500.00, 124750.00
+        ]
+
+    def test_elevations(self):
+        expected = [self.profile.elevation(s) for s in self.stations]
+        produced = self.profile.elevations(self.stations).tolist()
+        for e, p in zip(expected, produced):
+            self.assertAlmostEqual(e, p, 9)
+
+    def test_slopes(self):
+        expected = [self.profile.slope(s) for s in self.stations]
+        produced = self.profile.slopes(self.stations).tolist()
+        for e, p in zip(expected, produced):
+            self.assertAlmostEqual(e, p, 9)
+
+    def test_unsmooth_slopes(self):
+        profile = Profile()
+        profile.create_pt(000.0, 2.0)
+        profile.create_pt(100.0, 0.5)
+        profile.create_pt(200.0, 0.0)
+        profile.create_pt(300.0, 1.0)
+        profile.create_pt(400.0, 1.5)
+        stations = [50.0, 100.0, 150.0, 200.0, 300.0, 350.0]
+        expected = [profile.slope(s) for s in stations]
+        produced = profile.slopes(stations).tolist()
+        self.assertListEqual(expected, produced)